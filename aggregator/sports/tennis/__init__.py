@@ -1,9 +1,30 @@
 """
 Tennis module for handling tennis data aggregation and processing.
+
+The classes below are imported on first access, so importing one submodule
+(e.g. a fetcher or the tick store) does not load the bot, FastAPI, uvicorn
+or rapidfuzz along with it.
 """
-from .tennis_bot import TennisBot
-from .betsapi_prematch import BetsapiPrematch
-from .rapid_tennis_fetcher import RapidInplayOddsFetcher
-from .tennis_merger import TennisMerger
+import importlib
+
+_LAZY_ATTRIBUTES = {
+    'TennisBot': '.tennis_bot',
+    'BetsapiPrematch': '.betsapi_prematch',
+    'RapidInplayOddsFetcher': '.rapid_tennis_fetcher',
+    'TennisMerger': '.tennis_merger',
+}
 
 __all__ = ['TennisBot', 'BetsapiPrematch', 'RapidInplayOddsFetcher', 'TennisMerger']
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -9,27 +9,42 @@ import time
 from typing import Any, Dict, List, Optional
 from asyncio import Semaphore
 
+from aggregator.sports.tennis.metrics import (
+    STAGE_SECONDS, UPSTREAM_BYTES, UPSTREAM_ERRORS, UPSTREAM_REQUESTS, UPSTREAM_RETRIES, UPSTREAM_SECONDS
+)
+from aggregator.sports.tennis.tracing import span, start_span
+
 # -----------------------------------------------------------------------------
 # Logging Configuration (Console + File)
 # -----------------------------------------------------------------------------
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)  # DEBUG logs everything, switch to INFO in prod
 
-# Console Handler
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.DEBUG)
-console_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-console_handler.setFormatter(console_formatter)
 
-# File Handler (writes at INFO level or higher)
-file_handler = logging.FileHandler("betsapi_prematch.log", mode='a')
-file_handler.setLevel(logging.INFO)
-file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-file_handler.setFormatter(file_formatter)
+def setup_logging() -> None:
+    """
+    Log to the console and betsapi_prematch.log. Called by the entry points
+    rather than at import time (so importing opens no files), and safe to
+    call more than once.
+    """
+    if logger.handlers:
+        return
+    logger.setLevel(logging.DEBUG)  # DEBUG logs everything, switch to INFO in prod
+
+    # Console Handler
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.DEBUG)
+    console_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    console_handler.setFormatter(console_formatter)
+
+    # File Handler (writes at INFO level or higher)
+    file_handler = logging.FileHandler("betsapi_prematch.log", mode='a')
+    file_handler.setLevel(logging.INFO)
+    file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    file_handler.setFormatter(file_formatter)
 
-# Add both handlers to logger
-logger.addHandler(console_handler)
-logger.addHandler(file_handler)
+    # Add both handlers to logger
+    logger.addHandler(console_handler)
+    logger.addHandler(file_handler)
 
 # -----------------------------------------------------------------------------
 # Hardcoded BetsAPI Credentials / Settings
@@ -75,40 +90,65 @@ class BetsapiPrematch:
         if params is None:
             params = {}
         params["token"] = self.token  # Always include the token in query params
+        endpoint = url[len(self.base_url):].strip("/")  # IDs are in the params, not the path
 
         attempt = 0
         while attempt < self.max_retries:
             attempt += 1
+            if attempt > 1:
+                UPSTREAM_RETRIES.inc("betsapi", endpoint)
+            # Starts before the semaphore, so time spent queued shows up as queued_ms
+            request = start_span("http", api="betsapi", endpoint=endpoint, attempt=attempt)
             try:
                 async with self.semaphore:
-                    async with session.get(url, params=params, timeout=10) as response:
-                        status = response.status
-                        if status == 200:
-                            data = await response.json()
-                            logger.debug(f"[{attempt}/{self.max_retries}] Success: {url}")
-                            return data
-                        elif status == 429:
-                            # Simple rate-limit handling: wait a couple seconds, then retry
-                            error_text = await response.text()
-                            logger.warning(f"[{attempt}/{self.max_retries}] 429 Rate Limit: {error_text}")
-                            if attempt < self.max_retries:
-                                await asyncio.sleep(2)  # Wait before next retry
-                            else:
-                                logger.error("Max retries reached after 429 rate limit.")
-                            continue
+                    start = time.perf_counter()
+                    request.set(queued_ms=round((start - request.start) * 1000, 3))
+                    try:
+                        async with session.get(url, params=params, timeout=10) as response:
+                            status = response.status
+                            body = await response.read()
+                    finally:
+                        # Failed and timed-out attempts count too: they are the slow ones.
+                        # Measured here so the waits before a retry are left out
+                        UPSTREAM_SECONDS.observe(time.perf_counter() - start, "betsapi", endpoint)
+                    UPSTREAM_REQUESTS.inc("betsapi", endpoint, str(status))
+                    request.set(status=status)
+                    if status == 200:
+                        UPSTREAM_BYTES.inc("betsapi", endpoint, amount=len(body))
+                        request.finish(bytes=len(body))
+                        data = await response.json()
+                        logger.debug(f"[{attempt}/{self.max_retries}] Success: {url}")
+                        return data
+                    elif status == 429:
+                        # Simple rate-limit handling: wait a couple seconds, then retry
+                        UPSTREAM_ERRORS.inc("betsapi", endpoint, "rate_limited")
+                        error_text = await response.text()
+                        request.finish(error="rate_limited")
+                        logger.warning(f"[{attempt}/{self.max_retries}] 429 Rate Limit: {error_text}")
+                        if attempt < self.max_retries:
+                            await asyncio.sleep(2)  # Wait before next retry
                         else:
-                            # Other errors (4xx, 5xx, etc.)
-                            error_text = await response.text()
-                            logger.error(f"[{attempt}/{self.max_retries}] Error {status}: {error_text}")
-                            # No auto retry on these unless you want to handle 500, etc.
-                            return {}
+                            logger.error("Max retries reached after 429 rate limit.")
+                        continue
+                    else:
+                        # Other errors (4xx, 5xx, etc.)
+                        UPSTREAM_ERRORS.inc("betsapi", endpoint, "http_status")
+                        error_text = await response.text()
+                        request.finish(error="http_status")
+                        logger.error(f"[{attempt}/{self.max_retries}] Error {status}: {error_text}")
+                        # No auto retry on these unless you want to handle 500, etc.
+                        return {}
             except asyncio.TimeoutError:
+                UPSTREAM_ERRORS.inc("betsapi", endpoint, "timeout")
+                request.finish(error="timeout")
                 logger.error(f"[{attempt}/{self.max_retries}] Request timed out for URL: {url}")
                 if attempt < self.max_retries:
                     await asyncio.sleep(2)  # Wait before retry
                 else:
                     logger.error("Max retries reached on timeout.")
             except aiohttp.ClientError as e:
+                UPSTREAM_ERRORS.inc("betsapi", endpoint, "client_error")
+                request.finish(error="client_error")
                 logger.error(f"[{attempt}/{self.max_retries}] ClientError for URL {url}: {e}")
                 # Depending on the error type, you could decide to retry
                 # Here we'll just do a short wait and try again
@@ -118,12 +158,16 @@ class BetsapiPrematch:
                     logger.error("Max retries reached on client error.")
             except Exception as e:
                 # Unexpected exception
+                UPSTREAM_ERRORS.inc("betsapi", endpoint, "unexpected")
+                request.finish(error="unexpected")
                 logger.error(f"[{attempt}/{self.max_retries}] Unexpected error: {e}")
                 # Decide if you want to retry or break immediately
                 if attempt < self.max_retries:
                     await asyncio.sleep(2)
                 else:
                     logger.error("Max retries reached on unexpected error.")
+            finally:
+                request.finish()
             # If we get here, loop continues to next attempt
         return {}
 
@@ -135,7 +179,8 @@ class BetsapiPrematch:
         url = f"{self.base_url}/events/inplay"
         params = {"sport_id": SPORT_ID}
 
-        data = await self.fetch_data(url, session, params)
+        with STAGE_SECONDS.time("event_list_fetch", "betsapi"), span("event_list_fetch"):
+            data = await self.fetch_data(url, session, params)
         if not data or "results" not in data:
             logger.warning("No 'results' found in the in-play data.")
             return []
@@ -188,7 +233,8 @@ class BetsapiPrematch:
             tasks.append(self.fetch_prematch_data(bet365_id, session))
             valid_events.append((event, bet365_id))
 
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        with STAGE_SECONDS.time("prematch_fetch", "betsapi"), span("prematch_fetch", events=len(tasks)):
+            results = await asyncio.gather(*tasks, return_exceptions=True)
 
         combined = []
         for (inplay_event, bet365_id), prematch_data in zip(valid_events, results):
@@ -243,6 +289,8 @@ class BetsapiPrematch:
 # Quick Test / Example Usage
 # ------------------------------------------------------------------------------
 if __name__ == "__main__":
+    setup_logging()
+
     async def test_fetcher():
         # Suppose we want concurrency=5, up to 3 retries per request:
         fetcher = BetsapiPrematch(concurrency_limit=5, max_retries=3)
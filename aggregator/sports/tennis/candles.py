@@ -0,0 +1,112 @@
+"""
+Odds Candles for Tennis Bot
+
+Open/high/low/close candles of every price series at 10s, 1m and 5m
+resolutions, maintained incrementally: each new tick from the TickStore
+either extends the series' current candle or starts the next one, so serving
+candles never replays ticks or snapshots. Like the ticks, candles live in
+typed arrays (prices in 1/1000 ticks) and are evicted per match.
+
+An interval without any price movement has no candle; charts carry the
+previous close forward.
+"""
+
+import logging
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+from aggregator.sports.tennis.tick_store import from_ticks
+
+logger = logging.getLogger(__name__)
+
+RESOLUTIONS = {"10s": 10, "1m": 60, "5m": 300}
+
+
+class CandleSeries:
+    """
+    Candles of one price series at one resolution, as parallel arrays.
+    """
+
+    __slots__ = ("resolution", "starts", "opens", "highs", "lows", "closes", "updated")
+
+    def __init__(self, resolution: int):
+        self.resolution = resolution
+        self.starts = array("I")
+        self.opens = array("i")
+        self.highs = array("i")
+        self.lows = array("i")
+        self.closes = array("i")
+        self.updated = array("I")
+
+    def add(self, ts: int, price_ticks: int) -> None:
+        start = ts - ts % self.resolution
+        if self.starts and self.starts[-1] == start:
+            if price_ticks > self.highs[-1]:
+                self.highs[-1] = price_ticks
+            if price_ticks < self.lows[-1]:
+                self.lows[-1] = price_ticks
+            self.closes[-1] = price_ticks
+            self.updated[-1] = ts
+            return
+        self.starts.append(start)
+        self.opens.append(price_ticks)
+        self.highs.append(price_ticks)
+        self.lows.append(price_ticks)
+        self.closes.append(price_ticks)
+        self.updated.append(ts)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "t": self.starts[i],
+                "open": from_ticks(self.opens[i]),
+                "high": from_ticks(self.highs[i]),
+                "low": from_ticks(self.lows[i]),
+                "close": from_ticks(self.closes[i]),
+                "last_update": self.updated[i]
+            }
+            for i in range(len(self.starts))
+        ]
+
+
+class CandleStore:
+    """
+    Candles per match, (market, selection) and resolution. Register on_tick as
+    a TickStore tick listener to keep them up to date.
+    """
+
+    def __init__(self, resolutions: Optional[Dict[str, int]] = None):
+        self.resolutions = resolutions or RESOLUTIONS
+        self.matches: Dict[str, Dict[Tuple[str, str], Dict[str, CandleSeries]]] = {}
+
+    def on_tick(self, match_id: str, market: str, selection: str, ts: int, price_ticks: int) -> None:
+        series_by_key = self.matches.setdefault(match_id, {})
+        candles = series_by_key.get((market, selection))
+        if candles is None:
+            candles = series_by_key[(market, selection)] = {
+                name: CandleSeries(seconds) for name, seconds in self.resolutions.items()
+            }
+        for series in candles.values():
+            series.add(ts, price_ticks)
+
+    def evict_match(self, match_id: str) -> None:
+        self.matches.pop(str(match_id), None)
+
+    def get(self, match_id: str, market: str, selection: str, resolution: str) -> Optional[CandleSeries]:
+        candles = self.matches.get(str(match_id), {}).get((market, selection))
+        return candles.get(resolution) if candles else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "matches": len(self.matches),
+            "candles": {
+                name: sum(
+                    len(candles[name])
+                    for series_by_key in self.matches.values() for candles in series_by_key.values()
+                )
+                for name in self.resolutions
+            }
+        }
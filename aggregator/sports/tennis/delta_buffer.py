@@ -0,0 +1,110 @@
+"""
+Delta Ring Buffer for Tennis Bot
+
+Every data update gets a sequence number and a delta against the previous
+update: the matches that were added or changed ("upserts") and the IDs of the
+matches that went away ("removed"). The most recent deltas are kept in a
+bounded ring buffer so a client that reconnects with the last sequence number
+it saw can be sent only what it missed. A client that has fallen further
+behind than the buffer reaches gets a full snapshot instead.
+
+Sequence numbers start over in every run, so each one is only meaningful
+together with the epoch of the run that issued it. The buffer holds the deltas
+of one epoch at a time, and a seq from any other epoch is not covered.
+"""
+
+import hashlib
+import json
+import logging
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def hash_matches(matches: List[Dict[str, Any]]) -> Tuple[Dict[str, str], str]:
+    """
+    Hash every match individually and the list as a whole.
+    Returns ({match_id: hash}, combined hash).
+    """
+    match_hashes = {}
+    combined = hashlib.md5()
+    for match in matches:
+        match_hash = hashlib.md5(json.dumps(match, sort_keys=True).encode()).hexdigest()
+        match_hashes[str(match.get("match_id"))] = match_hash
+        combined.update(match_hash.encode())
+    return match_hashes, combined.hexdigest()
+
+
+def compute_delta(
+    old_hashes: Dict[str, str],
+    new_hashes: Dict[str, str],
+    new_matches: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Compute the delta between two versions from their per-match hashes.
+    """
+    upserts = [
+        match for match in new_matches
+        if old_hashes.get(str(match.get("match_id"))) != new_hashes.get(str(match.get("match_id")))
+    ]
+    removed = [match_id for match_id in old_hashes if match_id not in new_hashes]
+    return {"upserts": upserts, "removed": removed}
+
+
+class DeltaRingBuffer:
+    """
+    Bounded buffer of (seq, delta) pairs for the most recent updates of one epoch.
+    """
+
+    def __init__(self, maxlen: int = 50):
+        self.deltas = deque(maxlen=maxlen)
+        self.epoch = ""
+
+    def append(self, seq: int, delta: Dict[str, Any], epoch: str = "") -> None:
+        if epoch != self.epoch:
+            # Deltas of an earlier epoch cannot be applied to seqs of this one
+            self.deltas.clear()
+            self.epoch = epoch
+        self.deltas.append((seq, delta))
+
+    @property
+    def oldest_seq(self) -> Optional[int]:
+        return self.deltas[0][0] if self.deltas else None
+
+    @property
+    def latest_seq(self) -> Optional[int]:
+        return self.deltas[-1][0] if self.deltas else None
+
+    def since(self, seq: int, epoch: str = "") -> Optional[Dict[str, Any]]:
+        """
+        Merge every delta after seq into one, latest value per match winning.
+
+        Returns None if seq is not covered by the buffer (another epoch, too
+        old, or newer than anything we have), in which case the caller needs a
+        snapshot. Returns an empty delta if seq is already the latest.
+        """
+        if epoch != self.epoch:
+            return None
+        if not self.deltas or seq > self.latest_seq or seq < self.oldest_seq - 1:
+            return None
+
+        upserts: Dict[str, Dict[str, Any]] = {}
+        removed = set()
+        for delta_seq, delta in self.deltas:
+            if delta_seq <= seq:
+                continue
+            for match_id in delta["removed"]:
+                upserts.pop(match_id, None)
+                removed.add(match_id)
+            for match in delta["upserts"]:
+                match_id = str(match.get("match_id"))
+                removed.discard(match_id)
+                upserts[match_id] = match
+
+        return {
+            "from_seq": seq,
+            "seq": self.latest_seq,
+            "upserts": list(upserts.values()),
+            "removed": sorted(removed)
+        }
@@ -0,0 +1,163 @@
+"""
+NDJSON Export for Tennis Bot
+
+Streams archived match data as newline-delimited JSON for offline analysis:
+either every archived match version, or the odds ticks derived from them (one
+row per price change of a selection). Every stage is a generator (archive
+rows, then records, then lines, then chunks, then gzip), so only one batch of
+rows is ever held in memory and nothing is read from the archive until the
+consumer asks for the next chunk. The same pipeline serves /api/tennis/export
+and the command line:
+
+    python -m aggregator.sports.tennis.export --kind ticks --start 2026-10-18 \\
+        --end 2026-10-19 --tournament "ATP" --gzip -o ticks.ndjson.gz
+"""
+
+import json
+import logging
+import zlib
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from aggregator.sports.tennis.match_archive import MatchArchive
+from aggregator.sports.tennis.match_views import get_tournament_name
+from aggregator.sports.tennis.tick_store import iter_prematch_prices, iter_rapid_prices, to_ticks
+
+logger = logging.getLogger(__name__)
+
+EXPORT_KINDS = ("versions", "ticks")
+EXPORT_CHUNK_SIZE = 64 * 1024  # Bytes of NDJSON handed to the consumer at a time
+
+
+def parse_time(value: Optional[str]) -> Optional[float]:
+    """
+    Unix seconds from a number or an ISO date/datetime string; None passes through.
+    Raises ValueError for anything else.
+    """
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+def iter_archive_matches(archive: MatchArchive, start: float = 0, end: Optional[float] = None,
+                         tournament: Optional[str] = None,
+                         by_match: bool = False) -> Iterator[Tuple[str, float, int, Dict[str, Any]]]:
+    """
+    Archived (match_id, ts, version, match) rows in time order (grouped by
+    match first if by_match), optionally restricted to tournaments whose name
+    contains `tournament` (case-insensitive).
+    """
+    needle = tournament.lower() if tournament else None
+    for match_id, ts, version, match in archive.iter_rows(start, end, by_match=by_match):
+        if needle is None or needle in get_tournament_name(match).lower():
+            yield match_id, ts, version, match
+
+
+def iter_version_records(rows: Iterable[Tuple[str, float, int, Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+    for match_id, ts, version, match in rows:
+        yield {"match_id": match_id, "ts": ts, "version": version, "match": match}
+
+
+def iter_tick_records(rows: Iterable[Tuple[str, float, int, Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+    """
+    One record per price change of a selection, as the tick store would have
+    recorded it. The rows must be grouped by match, so only the last price of
+    each series of the current match has to be remembered.
+    """
+    last_prices: Dict[Tuple[str, str], int] = {}
+    current_match = None
+    for match_id, ts, version, match in rows:
+        if match_id != current_match:
+            # Done with the previous match's rows: forget its series
+            last_prices.clear()
+            current_match = match_id
+        for source in (iter_rapid_prices, iter_prematch_prices):
+            for market, selection, price in source(match):
+                key = (market, selection)
+                price_ticks = to_ticks(price)
+                if last_prices.get(key) == price_ticks:
+                    continue
+                last_prices[key] = price_ticks
+                yield {"match_id": match_id, "ts": ts, "market": market, "selection": selection, "price": price}
+
+
+def iter_ndjson_chunks(records: Iterable[Dict[str, Any]], chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    NDJSON lines joined into chunks of about chunk_size bytes.
+    """
+    lines = []
+    size = 0
+    for record in records:
+        line = json.dumps(record, separators=(",", ":")).encode() + b"\n"
+        lines.append(line)
+        size += len(line)
+        if size >= chunk_size:
+            yield b"".join(lines)
+            lines = []
+            size = 0
+    if lines:
+        yield b"".join(lines)
+
+
+def iter_gzip(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """
+    Gzip-compress a chunk stream incrementally (one gzip member for the whole stream).
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_ndjson(archive: MatchArchive, kind: str = "versions", start: float = 0, end: Optional[float] = None,
+                  tournament: Optional[str] = None, gzip: bool = False) -> Iterator[bytes]:
+    """
+    The full export pipeline: byte chunks of NDJSON, gzip-compressed if asked.
+    """
+    if kind not in EXPORT_KINDS:
+        raise ValueError(f"Unknown export kind {kind!r}, expected one of {', '.join(EXPORT_KINDS)}")
+    # Ticks are exported match by match, so their state stays bounded by one match
+    rows = iter_archive_matches(archive, start, end, tournament, by_match=(kind == "ticks"))
+    records = iter_version_records(rows) if kind == "versions" else iter_tick_records(rows)
+    chunks = iter_ndjson_chunks(records)
+    return iter_gzip(chunks) if gzip else chunks
+
+
+def main():
+    import argparse
+    import sys
+
+    from aggregator.sports.tennis.match_archive import ARCHIVE_PATH
+
+    parser = argparse.ArgumentParser(description="Export archived tennis data as NDJSON")
+    parser.add_argument("--kind", choices=EXPORT_KINDS, default="versions", help="Match versions or odds ticks")
+    parser.add_argument("--start", help="Unix seconds or ISO date/datetime (default: everything)")
+    parser.add_argument("--end", help="Unix seconds or ISO date/datetime (default: now)")
+    parser.add_argument("--tournament", help="Only tournaments whose name contains this")
+    parser.add_argument("--gzip", action="store_true", help="Gzip-compress the output")
+    parser.add_argument("--db", default=ARCHIVE_PATH, help="Match archive database")
+    parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+    args = parser.parse_args()
+    try:
+        start, end = parse_time(args.start) or 0, parse_time(args.end)
+    except ValueError:
+        parser.error("--start and --end must be Unix seconds or ISO dates")
+
+    archive = MatchArchive(args.db)
+    chunks = export_ndjson(archive, args.kind, start, end, args.tournament, args.gzip)
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        for chunk in chunks:
+            out.write(chunk)
+    finally:
+        if args.output:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Import-Time Benchmark for Tennis Bot
+
+Imports each entry module in a fresh interpreter with `python -X importtime`
+(from an empty working directory) and reports:
+
+  - the cumulative import time (median of several runs)
+  - the slowest modules it pulled in, by self time
+  - which heavy dependencies (FastAPI, uvicorn, rapidfuzz, ...) got loaded
+  - any files the import created, which should be none
+
+Usage:
+    python -m aggregator.sports.tennis.import_benchmark [--runs 5] [--top 5] [module ...]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Tuple
+
+DEFAULT_MODULES = [
+    "aggregator.sports.tennis",
+    "aggregator.sports.tennis.betsapi_prematch",
+    "aggregator.sports.tennis.rapid_tennis_fetcher",
+    "aggregator.sports.tennis.tick_store",
+    "aggregator.sports.tennis.export",
+    "aggregator.sports.tennis.tennis_bot",
+]
+HEAVY_MODULES = ["fastapi", "starlette", "uvicorn", "pydantic", "rapidfuzz", "aiohttp", "pytz", "requests"]
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """
+    (module, self_us, cumulative_us) for every line of -X importtime output.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def measure(module: str) -> Tuple[List[Tuple[str, int, int]], List[str]]:
+    """
+    Import a module once in a fresh interpreter. Returns the importtime rows
+    and the files the import left in its (empty) working directory.
+    """
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    with tempfile.TemporaryDirectory() as cwd:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=cwd, env=env, capture_output=True, text=True
+        )
+        created = sorted(os.listdir(cwd))
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+    return parse_importtime(result.stderr), created
+
+
+def benchmark(module: str, runs: int) -> Dict:
+    totals = []
+    rows, created = [], []
+    for _ in range(runs):
+        rows, created = measure(module)
+        totals.append(next(cumulative for name, _, cumulative in reversed(rows) if name == module))
+    loaded = {name for name, _, _ in rows}
+    return {
+        "module": module,
+        "median_ms": statistics.median(totals) / 1000,
+        "slowest": sorted(rows, key=lambda row: row[1], reverse=True),
+        "heavy": [name for name in HEAVY_MODULES if name in loaded],
+        "created": created,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import times of the tennis modules")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--runs", type=int, default=5, help="Imports per module (the median is reported)")
+    parser.add_argument("--top", type=int, default=5, help="Slowest imported modules to list, by self time")
+    args = parser.parse_args()
+
+    for module in args.modules:
+        report = benchmark(module, args.runs)
+        print(f"{module}: {report['median_ms']:.1f} ms (median of {args.runs})")
+        print(f"  heavy dependencies loaded: {', '.join(report['heavy']) or 'none'}")
+        if report["created"]:
+            print(f"  WARNING: import created files: {', '.join(report['created'])}")
+        for name, self_us, _ in report["slowest"][:args.top]:
+            print(f"    {self_us / 1000:7.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+Match Archive for Tennis Bot
+
+An append-only SQLite archive (WAL mode) of every version of every match, so
+the evolution of scores and odds outlives the in-memory history cache.
+
+Each update's changed matches are queued by the event loop and written by a
+background thread in one transaction, zlib-compressed and indexed by match
+ID and timestamp, so looking up the state of a match at any time is a single
+index seek. Rows older than the retention period are deleted; rows older than
+the compaction age are thinned to one per match per compaction bucket.
+Readers use their own per-thread connections, which WAL lets run alongside
+the writer.
+"""
+
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_PATH = os.getenv("MATCH_ARCHIVE_PATH", "match_archive.db")
+ARCHIVE_RETENTION_DAYS = float(os.getenv("MATCH_ARCHIVE_RETENTION_DAYS", "30"))
+ARCHIVE_COMPACT_AFTER_HOURS = float(os.getenv("MATCH_ARCHIVE_COMPACT_AFTER_HOURS", "24"))
+ARCHIVE_COMPACT_BUCKET = float(os.getenv("MATCH_ARCHIVE_COMPACT_BUCKET", "300"))
+ARCHIVE_MAINTENANCE_INTERVAL = 3600  # Seconds between retention/compaction runs
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS match_versions (
+    match_id TEXT NOT NULL,
+    ts REAL NOT NULL,
+    version INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_match_versions_match_ts ON match_versions (match_id, ts);
+CREATE INDEX IF NOT EXISTS idx_match_versions_ts ON match_versions (ts);
+"""
+
+
+def compress_match(match: Dict[str, Any]) -> bytes:
+    return zlib.compress(json.dumps(match).encode(), 6)
+
+
+def decompress_match(data: bytes) -> Dict[str, Any]:
+    return json.loads(zlib.decompress(data))
+
+
+class MatchArchive:
+    """
+    SQLite archive of match versions with a background writer thread.
+    """
+
+    def __init__(
+        self,
+        path: str = ARCHIVE_PATH,
+        retention_days: float = ARCHIVE_RETENTION_DAYS,
+        compact_after_hours: float = ARCHIVE_COMPACT_AFTER_HOURS,
+        compact_bucket: float = ARCHIVE_COMPACT_BUCKET
+    ):
+        """
+        :param path: SQLite database file.
+        :param retention_days: Rows older than this are deleted.
+        :param compact_after_hours: Rows older than this are thinned out.
+        :param compact_bucket: Seconds per match kept as a single row once compacted.
+        """
+        self.path = path
+        self.retention = retention_days * 86400
+        self.compact_after = compact_after_hours * 3600
+        self.compact_bucket = compact_bucket
+        self.queue: "queue.Queue" = queue.Queue()
+        self.local = threading.local()
+        self.writer: Optional[threading.Thread] = None
+        self.start_lock = threading.Lock()
+        self.rows_written = 0
+        self.rows_deleted = 0
+        self.last_maintenance = None
+
+    def connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def start(self) -> None:
+        """Start the writer thread (done automatically by the first record())"""
+        with self.start_lock:
+            if self.writer is not None:
+                return
+            conn = self.connect()
+            conn.executescript(SCHEMA)
+            conn.close()
+            self.writer = threading.Thread(target=self._write_loop, name="match-archive", daemon=True)
+            self.writer.start()
+            logger.info(f"Match archive writing to {self.path}")
+
+    def record(self, version: int, ts: float, matches: List[Dict[str, Any]]) -> None:
+        """
+        Queue the changed matches of one version. Never blocks on the database.
+        The matches must not be modified afterwards.
+        """
+        if not matches:
+            return
+        if self.writer is None:
+            self.start()
+        self.queue.put((version, ts, matches))
+
+    def _write_loop(self) -> None:
+        conn = self.connect()
+        next_maintenance = time.time() + 60
+        while True:
+            try:
+                item = self.queue.get(timeout=max(1.0, next_maintenance - time.time()))
+            except queue.Empty:
+                item = None
+
+            if item is not None:
+                # Take everything that piled up into the same transaction
+                batch = [item]
+                while True:
+                    try:
+                        batch.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+                try:
+                    self._write_batch(conn, batch)
+                except Exception as e:
+                    logger.error(f"Error writing {len(batch)} updates to match archive: {e}")
+
+            if time.time() >= next_maintenance:
+                try:
+                    self.maintain(conn)
+                except Exception as e:
+                    logger.error(f"Error compacting match archive: {e}")
+                next_maintenance = time.time() + ARCHIVE_MAINTENANCE_INTERVAL
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: list) -> None:
+        rows = [
+            (str(match.get("match_id")), ts, version, compress_match(match))
+            for version, ts, matches in batch
+            for match in matches
+            if match.get("match_id")
+        ]
+        with conn:
+            conn.executemany("INSERT INTO match_versions (match_id, ts, version, data) VALUES (?, ?, ?, ?)", rows)
+        self.rows_written += len(rows)
+
+    def maintain(self, conn: Optional[sqlite3.Connection] = None) -> int:
+        """
+        Apply retention and compaction. Returns the number of rows deleted.
+        """
+        owned = conn is None
+        if owned:
+            conn = self.connect()
+        try:
+            now = time.time()
+            with conn:
+                deleted = conn.execute(
+                    "DELETE FROM match_versions WHERE ts < ?", (now - self.retention,)
+                ).rowcount
+                # Keep the last row of each match in each bucket of compacted time
+                deleted += conn.execute(
+                    """
+                    DELETE FROM match_versions WHERE ts < :cutoff AND rowid NOT IN (
+                        SELECT MAX(rowid) FROM match_versions WHERE ts < :cutoff
+                        GROUP BY match_id, CAST(ts / :bucket AS INTEGER)
+                    )
+                    """,
+                    {"cutoff": now - self.compact_after, "bucket": self.compact_bucket}
+                ).rowcount
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.rows_deleted += deleted
+            self.last_maintenance = now
+            if deleted:
+                logger.info(f"Match archive maintenance removed {deleted} rows")
+            return deleted
+        finally:
+            # A connection opened here is not kept anywhere else
+            if owned:
+                conn.close()
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = self.connect()
+            self.local.conn = conn
+        return conn
+
+    def state_at(self, match_id: str, ts: float) -> Optional[Dict[str, Any]]:
+        """
+        The archived state of a match as of time ts (the latest version at or
+        before it), as {"ts", "version", "match"}, or None.
+        """
+        row = self._reader().execute(
+            "SELECT ts, version, data FROM match_versions WHERE match_id = ? AND ts <= ? "
+            "ORDER BY ts DESC LIMIT 1",
+            (match_id, ts)
+        ).fetchone()
+        if row is None:
+            return None
+        return {"ts": row[0], "version": row[1], "match": decompress_match(row[2])}
+
+    def versions(self, match_id: str, start: float = 0, end: Optional[float] = None,
+                 limit: int = 1000) -> List[Dict[str, Any]]:
+        """
+        Timestamps and versions archived for a match between start and end.
+        """
+        rows = self._reader().execute(
+            "SELECT ts, version FROM match_versions WHERE match_id = ? AND ts >= ? AND ts <= ? "
+            "ORDER BY ts LIMIT ?",
+            (match_id, start, end if end is not None else time.time(), limit)
+        ).fetchall()
+        return [{"ts": ts, "version": version} for ts, version in rows]
+
+    def iter_rows(self, start: float = 0, end: Optional[float] = None, batch_size: int = 500,
+                  by_match: bool = False) -> Iterator[Tuple[str, float, int, Dict[str, Any]]]:
+        """
+        Yield (match_id, ts, version, match) for every row between start and
+        end in time order (grouped by match first if by_match), fetching
+        batch_size rows at a time so memory stays flat however many rows
+        match. Uses its own connection, which may be advanced from any thread
+        (e.g. a StreamingResponse's threadpool).
+        """
+        order = "match_id, ts" if by_match else "ts"
+        conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        try:
+            cursor = conn.execute(
+                f"SELECT match_id, ts, version, data FROM match_versions WHERE ts >= ? AND ts <= ? ORDER BY {order}",
+                (start, end if end is not None else time.time())
+            )
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for match_id, ts, version, data in rows:
+                    yield match_id, ts, version, decompress_match(data)
+        finally:
+            conn.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "queued": self.queue.qsize(),
+            "rows_written": self.rows_written,
+            "rows_deleted": self.rows_deleted,
+            "last_maintenance": self.last_maintenance,
+            "retention_days": self.retention / 86400
+        }
+
+
+if __name__ == "__main__":
+    # Quick test: archive a few versions, compact them and time a point lookup
+    import tempfile
+
+    path = os.path.join(tempfile.mkdtemp(), "archive.db")
+    archive = MatchArchive(path, compact_after_hours=0, compact_bucket=60)
+    now = time.time()
+    for i in range(600):
+        archive.record(i, now - 3600 + i * 5, [{"match_id": f"m{m}", "ss": f"{i}-{m}"} for m in range(50)])
+    while archive.queue.qsize():
+        time.sleep(0.1)
+    time.sleep(0.5)
+    start = time.perf_counter()
+    state = archive.state_at("m7", now - 1800)
+    print(f"state_at: {state['match']} ({(time.perf_counter() - start) * 1000:.2f} ms)")
+    print(f"rows written: {archive.rows_written}, deleted by compaction: {archive.maintain()}")
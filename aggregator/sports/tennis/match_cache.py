@@ -0,0 +1,103 @@
+"""
+Match History Cache for Tennis Bot
+
+A bounded cache for matches that are no longer live: entries expire after a
+TTL and, once the cache is full, the least recently used entry is evicted.
+Expired entries are dropped on read and by a periodic sweep, so memory stays
+bounded through a long tournament week. Hits, misses, evictions and
+expirations are counted.
+
+The cache is shared between the event loop and FastAPI's threadpool (sync
+endpoints), so every operation takes a lock.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LRUTTLCache:
+    """
+    Least-recently-used cache whose entries also expire after ttl seconds.
+    """
+
+    def __init__(self, max_entries: int = 2000, ttl: float = 3600):
+        """
+        :param max_entries: Maximum number of entries before LRU eviction.
+        :param ttl: Seconds an entry stays valid after it was set.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Return the cached value, or None if it is missing or expired.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, stored_at = entry
+            if time.time() - stored_at >= self.ttl:
+                del self.entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self.lock:
+            self.entries[key] = (value, time.time())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: str) -> None:
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def sweep(self) -> int:
+        """
+        Drop every expired entry. Returns the number of entries removed.
+        """
+        cutoff = time.time() - self.ttl
+        with self.lock:
+            expired = [key for key, (_, stored_at) in self.entries.items() if stored_at <= cutoff]
+            for key in expired:
+                del self.entries[key]
+            self.expirations += len(expired)
+        if expired:
+            logger.info(f"Swept {len(expired)} expired entries from match cache")
+        return len(expired)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
@@ -0,0 +1,157 @@
+"""
+Match Views for Tennis Bot
+
+This module derives lightweight read-only views from merged match records
+(the output of TennisMerger), such as the compact summary row used by the
+match list. It never modifies the records it is given.
+"""
+
+from typing import Any, Dict, List, Optional
+
+
+def get_inplay_event(match: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Return the BetsAPI in-play event of a merged match, or an empty dict.
+    Handles both the 'inplay_event' key written by BetsapiPrematch and the
+    'inplayEvent' key used by the debug/fallback records.
+    """
+    betsapi_data = match.get("betsapi_data") or {}
+    return betsapi_data.get("inplay_event") or betsapi_data.get("inplayEvent") or {}
+
+
+def get_tournament_name(match: Dict[str, Any]) -> str:
+    """
+    Return the tournament (league) name of a merged match, or an empty string.
+    """
+    league = get_inplay_event(match).get("league") or {}
+    return str(league.get("name") or "")
+
+
+def get_player_names(match: Dict[str, Any]) -> tuple:
+    """
+    Return (home, away) player names, preferring BetsAPI and falling back to RapidAPI.
+    """
+    inplay = get_inplay_event(match)
+    home = (inplay.get("home") or {}).get("name", "")
+    away = (inplay.get("away") or {}).get("name", "")
+
+    if not home or not away:
+        raw_event = (match.get("rapid_data") or {}).get("raw_event_data") or {}
+        home = home or raw_event.get("team1", "")
+        away = away or raw_event.get("team2", "")
+
+    return home, away
+
+
+def get_headline_prices(match: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Return the match winner selections of a merged match as [{'name': ..., 'odds': ...}, ...].
+    Returns an empty list if the match has no RapidAPI winner market.
+    """
+    raw_odds_data = (match.get("rapid_data") or {}).get("raw_odds_data") or {}
+    market = find_winner_market(raw_odds_data.get("markets") or [])
+    if not market:
+        return []
+
+    prices = []
+    for selection in iter_selections(market):
+        prices.append({
+            "name": selection.get("name", ""),
+            "odds": selection.get("odds", selection.get("price"))
+        })
+    return prices
+
+
+def find_winner_market(markets: Any) -> Optional[Dict[str, Any]]:
+    """
+    Find the match winner market among RapidAPI markets (a list or a dict keyed by market ID).
+    """
+    candidates = markets.values() if isinstance(markets, dict) else markets
+    for market in candidates:
+        if not isinstance(market, dict):
+            continue
+        name = str(market.get("name") or market.get("group") or "").lower()
+        if "match winner" in name or "to win match" in name:
+            return market
+    return None
+
+
+def iter_selections(market: Dict[str, Any]):
+    """
+    Yield the selection dicts of a RapidAPI market, whether they are stored
+    as a list or as a dict keyed by selection name.
+    """
+    selections = market.get("selections") or market.get("odds") or []
+    if isinstance(selections, dict):
+        for name, selection in selections.items():
+            if isinstance(selection, dict):
+                yield {"name": name, **selection}
+    elif isinstance(selections, list):
+        for selection in selections:
+            if isinstance(selection, dict):
+                yield selection
+
+
+def summarize_match(match: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the compact list-view row for a merged match: players, score,
+    status and headline prices, without any raw API payloads.
+    """
+    inplay = get_inplay_event(match)
+    home, away = get_player_names(match)
+
+    return {
+        "match_id": match.get("match_id"),
+        "tournament": get_tournament_name(match),
+        "home": home,
+        "away": away,
+        "ss": inplay.get("ss", ""),
+        "scores": inplay.get("scores") or {},
+        "points": inplay.get("points", ""),
+        "time": inplay.get("time"),
+        "time_status": inplay.get("time_status"),
+        "has_betsapi": bool(match.get("betsapi_data")),
+        "has_rapid": bool(match.get("rapid_data")),
+        "prices": get_headline_prices(match)
+    }
+
+
+def parse_fields(raw: Optional[str]) -> List[str]:
+    """
+    Parse a comma separated ?fields= value into a sorted list of unique
+    field paths. Nested fields use dots, e.g. "betsapi_data.inplay_event.ss".
+    """
+    if not raw:
+        return []
+    return sorted({field.strip() for field in raw.split(",") if field.strip()})
+
+
+def project_match(match: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    """
+    Copy only the requested (possibly dotted) field paths of a match into a
+    new, nested dict. Paths that do not exist in the match are left out.
+    """
+    projected: Dict[str, Any] = {}
+    for field in fields:
+        keys = field.split(".")
+        value: Any = match
+        for key in keys:
+            if not isinstance(value, dict) or key not in value:
+                break
+            value = value[key]
+        else:
+            target = projected
+            for key in keys[:-1]:
+                target = target.setdefault(key, {})
+                if not isinstance(target, dict):
+                    break
+            else:
+                target[keys[-1]] = value
+    return projected
+
+
+def build_live_board(matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Summary rows for every match, in the same order as the matches.
+    """
+    return [summarize_match(match) for match in matches]
@@ -2,17 +2,31 @@ import logging
 import aiohttp
 import asyncio
 from typing import Any, Dict, List
+import time
 from asyncio import Semaphore
 
-# Configure root logger once here
+from aggregator.sports.tennis.metrics import (
+    STAGE_SECONDS, UPSTREAM_BYTES, UPSTREAM_ERRORS, UPSTREAM_REQUESTS, UPSTREAM_SECONDS
+)
+from aggregator.sports.tennis.tracing import span, start_span
+
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)  # DEBUG for detailed logs; change to INFO in production
 
-stream_handler = logging.StreamHandler()
-stream_handler.setLevel(logging.DEBUG)
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-stream_handler.setFormatter(formatter)
-logger.addHandler(stream_handler)
+
+def setup_logging() -> None:
+    """
+    Log to the console. Called by the entry points rather than at import time,
+    and safe to call more than once.
+    """
+    if logger.handlers:
+        return
+    logger.setLevel(logging.DEBUG)  # DEBUG for detailed logs; change to INFO in production
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setLevel(logging.DEBUG)
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    stream_handler.setFormatter(formatter)
+    logger.addHandler(stream_handler)
 
 # --- HARDCODED API CREDENTIALS & URLS HERE ---
 API_KEY = "750ad01770msh9716fc05e7ecc56p15565fjsn93e405806783"
@@ -38,31 +52,56 @@ class RapidInplayOddsFetcher:
         }
         self.semaphore = Semaphore(MAX_CONCURRENT_REQUESTS)  # Concurrency limit
 
-    async def fetch_data(self, url: str, session: aiohttp.ClientSession) -> Any:
-        """Make async HTTP request to RapidAPI; return raw JSON or an empty dict on error."""
+    async def fetch_data(self, url: str, session: aiohttp.ClientSession, endpoint: str = "other") -> Any:
+        """
+        Make async HTTP request to RapidAPI; return raw JSON or an empty dict on error.
+        endpoint names the kind of request in the metrics (URLs contain event IDs).
+        """
         logger.debug(f"Fetching data from URL: {url}")
+        request = start_span("http", api="rapidapi", endpoint=endpoint)
+        start = None
         try:
             # Use the semaphore to limit concurrent requests
             async with self.semaphore:
+                start = time.perf_counter()
+                request.set(queued_ms=round((start - request.start) * 1000, 3))
                 async with session.get(url, headers=self.headers, timeout=10) as response:
+                    UPSTREAM_REQUESTS.inc("rapidapi", endpoint, str(response.status))
+                    request.set(status=response.status)
                     if response.status == 200:
+                        body = await response.read()
+                        UPSTREAM_BYTES.inc("rapidapi", endpoint, amount=len(body))
+                        request.finish(bytes=len(body))
                         logger.debug(f"Data fetched successfully from: {url}")
                         return await response.json()
                     else:
+                        UPSTREAM_ERRORS.inc("rapidapi", endpoint, "http_status")
+                        request.finish(error="http_status")
                         error_text = await response.text()
                         logger.error(
                             f"RapidAPI error: Status code {response.status} - {error_text}"
                         )
                         return {}
         except asyncio.TimeoutError:
+            UPSTREAM_ERRORS.inc("rapidapi", endpoint, "timeout")
+            request.finish(error="timeout")
             logger.error(f"Request timed out for URL: {url}")
             return {}
         except aiohttp.ClientError as e:
+            UPSTREAM_ERRORS.inc("rapidapi", endpoint, "client_error")
+            request.finish(error="client_error")
             logger.error(f"ClientError for URL {url}: {e}")
             return {}
         except Exception as e:
+            UPSTREAM_ERRORS.inc("rapidapi", endpoint, "unexpected")
+            request.finish(error="unexpected")
             logger.error(f"Unexpected error in fetch_data for URL {url}: {str(e)}")
             return {}
+        finally:
+            # Failed and timed-out requests count too: they are the slow ones
+            if start is not None:
+                UPSTREAM_SECONDS.observe(time.perf_counter() - start, "rapidapi", endpoint)
+            request.finish()
 
     async def fetch_odds_for_events(
         self,
@@ -94,11 +133,12 @@ class RapidInplayOddsFetcher:
 
             # Prepare concurrency tasks
             odds_url = f"{self.base_url}/bet365/get_event_with_markets/{event_id}"
-            tasks.append(self.fetch_data(odds_url, session))
+            tasks.append(self.fetch_data(odds_url, session, "get_event_with_markets"))
             valid_events.append(event)
 
         # Fetch all odds concurrently
-        odds_data_list = await asyncio.gather(*tasks, return_exceptions=True)
+        with STAGE_SECONDS.time("odds_fetch", "rapidapi"), span("odds_fetch", events=len(tasks)):
+            odds_data_list = await asyncio.gather(*tasks, return_exceptions=True)
 
         matches = []
         for event, odds_data in zip(valid_events, odds_data_list):
@@ -135,7 +175,8 @@ class RapidInplayOddsFetcher:
                 # 1) Fetch the list of in-play tennis events
                 events_url = f"{self.base_url}/bet365/get_sport_events/tennis"
                 logger.debug("Fetching in-play tennis events...")
-                events_data = await self.fetch_data(events_url, session)
+                with STAGE_SECONDS.time("event_list_fetch", "rapidapi"), span("event_list_fetch"):
+                    events_data = await self.fetch_data(events_url, session, "get_sport_events")
 
                 if not events_data:
                     logger.warning("No tennis events found from RapidAPI (events_data empty).")
@@ -152,7 +193,7 @@ class RapidInplayOddsFetcher:
 
 # Example usage / quick test
 if __name__ == "__main__":
-    # No separate logging config call here, we already configured the logger above.
+    setup_logging()
 
     async def test_fetcher():
         fetcher = RapidInplayOddsFetcher()
@@ -0,0 +1,96 @@
+"""
+Relay State for Tennis Bot
+
+A main_api instance in relay mode follows another instance's /ws delta
+stream instead of the bot, and serves its own clients from that. RelayState
+rebuilds the upstream match list from the stream's frames:
+
+  - {"type": "snapshot", "seq": N, "epoch": E, "matches": [...]} replaces everything
+  - {"type": "delta", "epoch": E, "from_seq": M, "seq": N, "upserts": [...], "removed": [...]}
+    applies on top of version M of epoch E
+  - {"type": "heartbeat", "version": N, "epoch": E} confirms nothing was missed
+
+The relay keeps the upstream's sequence numbers and epoch as its own, so
+clients can resume from a seq on any instance in the chain. Whenever a frame
+does not follow on from what the relay has (a gap, a heartbeat for a version
+it never received, or a frame of another epoch after the upstream
+restarted), apply() asks for a resync, and the caller sends a resume request
+upstream.
+
+A relay that is rate limited upstream gets coalesced frames that skip seqs.
+apply() flags those as a gap: the relay's own deltas then do not cover the
+skipped versions, so it must not let clients resume from them.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+RESYNC = "resync"
+
+
+class RelayState:
+    """
+    The upstream match list as of sequence number `seq` of epoch `epoch`.
+    """
+
+    def __init__(self):
+        self.seq: Optional[int] = None
+        self.epoch: Optional[str] = None
+        self.gap = False  # Whether the last update skipped seqs of the same epoch
+        self.matches: Dict[str, Dict[str, Any]] = {}
+        self.resyncs = 0
+
+    def apply(self, frame: Dict[str, Any]) -> str:
+        """
+        Apply one upstream frame. Returns UPDATED if the match list moved to a
+        new seq, UNCHANGED if there was nothing to apply, or RESYNC if the
+        relay has fallen out of step and must resume from self.seq.
+        """
+        frame_type = frame.get("type")
+
+        if frame_type == "snapshot":
+            self.matches = {str(match.get("match_id")): match for match in frame.get("matches") or []}
+            self.gap = (
+                self.seq is not None and frame.get("epoch") == self.epoch
+                and frame.get("seq") not in (self.seq, self.seq + 1)
+            )
+            self.seq = frame.get("seq")
+            self.epoch = frame.get("epoch")
+            return UPDATED
+
+        if frame_type == "delta":
+            if self.seq is None or (frame.get("epoch"), frame.get("from_seq")) != (self.epoch, self.seq):
+                return self._resync(
+                    f"delta from seq {frame.get('epoch')}:{frame.get('from_seq')} while at {self.epoch}:{self.seq}"
+                )
+            for match_id in frame.get("removed") or []:
+                self.matches.pop(str(match_id), None)
+            for match in frame.get("upserts") or []:
+                self.matches[str(match.get("match_id"))] = match
+            if frame.get("seq") == self.seq:
+                return UNCHANGED
+            self.gap = frame.get("seq") != self.seq + 1
+            self.seq = frame.get("seq")
+            return UPDATED
+
+        if frame_type == "heartbeat":
+            if (frame.get("epoch"), frame.get("version")) != (self.epoch, self.seq):
+                return self._resync(
+                    f"heartbeat for version {frame.get('epoch')}:{frame.get('version')} while at {self.epoch}:{self.seq}"
+                )
+            return UNCHANGED
+
+        logger.debug(f"Relay ignoring upstream frame of type {frame_type!r}")
+        return UNCHANGED
+
+    def _resync(self, reason: str) -> str:
+        self.resyncs += 1
+        logger.warning(f"Relay out of step with upstream ({reason}), resyncing")
+        return RESYNC
+
+    def match_list(self) -> List[Dict[str, Any]]:
+        return list(self.matches.values())
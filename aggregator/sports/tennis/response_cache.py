@@ -0,0 +1,161 @@
+"""
+REST Response Cache for Tennis Bot
+
+Renders each REST response once per data version into JSON bytes plus gzip
+and brotli variants, and serves those bytes to every request for the same
+version. Request cost is then a dict lookup regardless of request rate; the
+serialization and compression cost is paid once per update and per response.
+
+When the data version changes, everything rendered for the old version is
+dropped on the next lookup.
+
+Because a body never changes within a version, the version also serves as a
+strong ETag: a client presenting the current one in If-None-Match gets a 304
+without anything being rendered or sent. Version numbers start over in every
+process, so the tag also carries the epoch (the run) the version was made in.
+"""
+
+import gzip
+import json
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+try:
+    import brotli
+except ImportError:  # Optional dependency, only needed for the br encoding
+    brotli = None
+
+from aggregator.sports.tennis.metrics import STAGE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+GZIP_LEVEL = int(os.getenv("RESPONSE_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("RESPONSE_BROTLI_QUALITY", "5"))
+
+# Responses smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 512
+
+
+def render_variants(payload: Any) -> Dict[str, bytes]:
+    """
+    Serialize a payload to JSON bytes and compress it with every available encoding.
+    """
+    return compress_variants(json.dumps(payload).encode())
+
+
+def compress_variants(body: bytes) -> Dict[str, bytes]:
+    """
+    Compress an already serialized JSON body with every available encoding.
+    """
+    variants = {"identity": body}
+    if len(body) >= MIN_COMPRESS_SIZE:
+        variants["gzip"] = gzip.compress(body, compresslevel=GZIP_LEVEL)
+        if brotli is not None:
+            variants["br"] = brotli.compress(body, quality=BROTLI_QUALITY)
+    return variants
+
+
+def choose_encoding(accept_encoding: str, variants: Dict[str, bytes]) -> str:
+    """
+    Pick the best variant the client accepts: brotli, then gzip, then identity.
+    """
+    accepted = set()
+    for item in (accept_encoding or "").split(","):
+        coding, _, params = item.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        accepted.add(coding.strip().lower())
+
+    for encoding in ("br", "gzip"):
+        if encoding in variants and (encoding in accepted or "*" in accepted):
+            return encoding
+    return "identity"
+
+
+def make_etag(version: int, encoding: str = "identity", epoch: str = "") -> str:
+    """
+    Strong ETag for a response body at a data version of an epoch. Compressed
+    variants are different byte sequences, so they get their own tag.
+    """
+    tag = f"{epoch}-v{version}" if epoch else f"v{version}"
+    if encoding == "identity":
+        return f'"{tag}"'
+    return f'"{tag}-{encoding}"'
+
+
+def etag_matches(if_none_match: str, version: int, epoch: str = "") -> bool:
+    """
+    Whether an If-None-Match header names any variant of this data version.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    current = {make_etag(version, encoding, epoch) for encoding in ("identity", "gzip", "br")}
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag in current:
+            return True
+    return False
+
+
+class ResponseCache:
+    """
+    Pre-rendered response bodies for the current data version, by cache key.
+    """
+
+    def __init__(self):
+        self.version = None
+        self.entries: Dict[str, Dict[str, bytes]] = {}
+        self.lock = threading.Lock()
+        self.renders = 0
+        self.hits = 0
+
+    def get(self, version: Hashable, key: str, render: Callable[[], Any]) -> Dict[str, bytes]:
+        """
+        Return the rendered variants for key at version, rendering them with
+        render() if this is the first request for them. The version can be
+        any value that changes with the data, e.g. (epoch, version).
+        """
+        with self.lock:
+            if version != self.version:
+                self.version = version
+                self.entries = {}
+            variants = self.entries.get(key)
+            if variants is not None:
+                self.hits += 1
+                return variants
+
+        # Render outside the lock so one slow response does not hold up others
+        with STAGE_SECONDS.time("serialize", "main_api"):
+            variants = render_variants(render())
+        with self.lock:
+            self.renders += 1
+            if version == self.version:
+                variants = self.entries.setdefault(key, variants)
+        return variants
+
+    def put_body(self, version: Hashable, key: str, body: bytes) -> None:
+        """
+        Store a body that was serialized elsewhere (e.g. by another process)
+        so it does not have to be rendered again here.
+        """
+        variants = compress_variants(body)
+        with self.lock:
+            if version != self.version:
+                self.version = version
+                self.entries = {}
+            self.entries[key] = variants
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "entries": len(self.entries),
+            "renders": self.renders,
+            "hits": self.hits,
+            "encodings": ["identity", "gzip"] + (["br"] if brotli is not None else [])
+        }
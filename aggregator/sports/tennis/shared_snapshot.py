@@ -0,0 +1,113 @@
+"""
+Shared Memory Snapshots for Tennis Bot
+
+Lets one ingest process hand each versioned, pre-serialized snapshot to any
+number of API worker processes on the same host.
+
+The writer puts every version in a new file (on /dev/shm when available, so
+it never touches disk) and publishes it with an atomic rename over the shared
+path. A published file is never written again, so workers can mmap it and
+read it in place without locks: a worker that notices the path now points at
+a new file maps that one, and a mapping of the old file stays valid until it
+is closed, even after the file has been replaced.
+
+File layout: MAGIC, then version and body length as little-endian u64, then
+the body (the /api/tennis JSON).
+"""
+
+import logging
+import mmap
+import os
+import struct
+import tempfile
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"TSNP"
+HEADER = struct.Struct("<4sQQ")
+
+
+def default_snapshot_path() -> str:
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(directory, "tennis_snapshot")
+
+
+SHARED_SNAPSHOT_PATH = os.getenv("SHARED_SNAPSHOT_PATH") or default_snapshot_path()
+
+
+class SharedSnapshotWriter:
+    """
+    Publishes snapshot bodies to the shared path. Used by the ingest process only.
+    """
+
+    def __init__(self, path: str = SHARED_SNAPSHOT_PATH):
+        self.path = path
+        self.writes = 0
+
+    def write(self, version: int, body: bytes) -> None:
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, version, len(body)))
+            f.write(body)
+        # Readers see either the previous file or this one, never a partial write
+        os.replace(tmp_path, self.path)
+        self.writes += 1
+
+
+class SharedSnapshotReader:
+    """
+    Maps the latest published snapshot. Used by each API worker.
+    """
+
+    def __init__(self, path: str = SHARED_SNAPSHOT_PATH):
+        self.path = path
+        self.file_id = None
+        self.mapping: Optional[mmap.mmap] = None
+        self.version = None
+
+    def read_if_changed(self) -> Optional[Tuple[int, memoryview]]:
+        """
+        Return (version, body) if a new snapshot was published since the last
+        call, otherwise None. The body is a view into the mapping, valid until
+        the next call that returns a snapshot.
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        file_id = (stat.st_ino, stat.st_mtime_ns)
+        if file_id == self.file_id:
+            return None
+        if stat.st_size < HEADER.size:
+            # Still being created (or truncated); pick it up next time
+            return None
+
+        try:
+            with open(self.path, "rb") as f:
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError) as e:
+            # Replaced again between stat and open, or empty; pick it up next time
+            logger.debug(f"Shared snapshot not readable yet: {e}")
+            return None
+
+        if len(mapping) < HEADER.size:
+            mapping.close()
+            return None
+        magic, version, length = HEADER.unpack_from(mapping)
+        if magic != MAGIC or HEADER.size + length > len(mapping):
+            logger.error(f"Ignoring malformed shared snapshot at {self.path}")
+            mapping.close()
+            self.file_id = file_id
+            return None
+
+        if self.mapping is not None:
+            try:
+                self.mapping.close()
+            except BufferError:
+                # A view into the old snapshot is still alive; let GC unmap it
+                pass
+        self.mapping = mapping
+        self.file_id = file_id
+        self.version = version
+        return version, memoryview(mapping)[HEADER.size:HEADER.size + length]
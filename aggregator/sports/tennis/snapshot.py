@@ -0,0 +1,67 @@
+"""
+Tennis Data Snapshots for Tennis Bot
+
+The bot loop and its API thread share the latest merged data through a single
+module-level reference to a TennisSnapshot. A snapshot is built completely by
+the bot before the reference is swapped, and its data is never modified
+afterwards, so a reader that grabs the reference once has a consistent
+version, timestamp and match list without taking a lock or copying anything.
+Rebinding a global is atomic in CPython.
+
+The serialized JSON body is produced on first use and then kept on the
+snapshot, so consumers that only need the matches in memory never pay for it.
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+from aggregator.sports.tennis.metrics import STAGE_SECONDS
+
+
+class TennisSnapshot:
+    """
+    One published, immutable version of the bot's merged match data.
+    """
+
+    __slots__ = ("version", "timestamp", "matches", "_json_bytes")
+
+    def __init__(self, version: int, timestamp: Optional[str], matches: List[Dict[str, Any]]):
+        """
+        :param version: Incremented for every published snapshot.
+        :param timestamp: ISO timestamp of when the data was published.
+        :param matches: Merged matches; the bot must not modify them afterwards.
+        """
+        object.__setattr__(self, "version", version)
+        object.__setattr__(self, "timestamp", timestamp)
+        object.__setattr__(self, "matches", tuple(matches))
+        object.__setattr__(self, "_json_bytes", None)
+
+    @property
+    def json_bytes(self) -> bytes:
+        """
+        The snapshot as a {"timestamp", "version", "matches"} JSON body.
+        Two threads racing here both produce the same bytes, so no lock is needed.
+        """
+        if self._json_bytes is None:
+            with STAGE_SECONDS.time("serialize", "bot"):
+                object.__setattr__(self, "_json_bytes", json.dumps({
+                    "timestamp": self.timestamp,
+                    "version": self.version,
+                    "matches": list(self.matches)
+                }).encode())
+        return self._json_bytes
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("TennisSnapshot is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("TennisSnapshot is immutable")
+
+    def __len__(self) -> int:
+        return len(self.matches)
+
+    def __repr__(self) -> str:
+        return f"TennisSnapshot(version={self.version}, matches={len(self.matches)})"
+
+
+EMPTY_SNAPSHOT = TennisSnapshot(0, None, [])
@@ -0,0 +1,53 @@
+"""
+Snapshot Files for Tennis Bot
+
+Persists state to disk so a restarted process can serve (or resume from) its
+last known state immediately instead of starting cold. Files are written to a
+temporary file, fsynced and renamed over the target, so a crash mid-write
+leaves the previous file intact and a reader never sees a partial one.
+"""
+
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FILE_PATH = os.getenv("MAIN_API_SNAPSHOT_PATH", "main_api_snapshot.json")
+SNAPSHOT_SAVE_INTERVAL = float(os.getenv("MAIN_API_SNAPSHOT_SAVE_INTERVAL", "30"))
+# Older snapshots are ignored at startup: their matches have long moved on
+SNAPSHOT_MAX_AGE = float(os.getenv("MAIN_API_SNAPSHOT_MAX_AGE", "21600"))
+
+
+def atomic_write(path: str, body: bytes) -> None:
+    """
+    Replace the file at path with body, atomically.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(body)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_json_file(path: str, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """
+    The JSON object saved at path, or None if it is missing, unreadable or
+    (with max_age) older than max_age seconds.
+    """
+    try:
+        age = time.time() - os.path.getmtime(path)
+        if max_age is not None and age > max_age:
+            logger.info(f"Ignoring {path}, saved {age:.0f}s ago")
+            return None
+        with open(path, "rb") as f:
+            data = json.loads(f.read())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not load {path}: {e}")
+        return None
+    return data if isinstance(data, dict) else None
@@ -0,0 +1,114 @@
+"""
+Snapshot Stream for Tennis Bot
+
+Pushes every published TennisSnapshot from the bot process to local
+consumers (main_api) over a Unix domain socket, instead of having them poll
+/api/tennis over HTTP. Messages are the snapshot's JSON body followed by a
+newline (compact JSON never contains a raw newline).
+
+A consumer is sent the latest snapshot as soon as it connects, so
+reconnecting is all it takes to resync after the bot or the consumer
+restarts. A consumer that falls too far behind is disconnected rather than
+buffered without bound; it reconnects and resyncs the same way.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from typing import Any, AsyncIterator, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+IPC_SOCKET_PATH = os.getenv("TENNIS_BOT_IPC_SOCKET", "/tmp/tennis_bot.sock")
+
+# Largest snapshot message a consumer accepts
+IPC_MAX_MESSAGE = 64 * 1024 * 1024
+# Bytes queued for one consumer before it is considered stuck and dropped
+IPC_MAX_BUFFER = 4 * IPC_MAX_MESSAGE
+
+
+class SnapshotStreamServer:
+    """
+    Unix socket server, running on the bot's event loop, that fans each
+    published snapshot out to every connected consumer.
+    """
+
+    def __init__(self, path: str = IPC_SOCKET_PATH):
+        self.path = path
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.writers: Set[asyncio.StreamWriter] = set()
+        self.latest = None
+        self.messages_sent = 0
+
+    async def start(self) -> None:
+        # A socket file left behind by a previous run would make bind() fail
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self.server = await asyncio.start_unix_server(self._handle_consumer, path=self.path)
+        logger.info(f"Snapshot stream listening on {self.path}")
+
+    async def close(self) -> None:
+        for writer in list(self.writers):
+            writer.close()
+        self.writers.clear()
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def publish(self, snapshot) -> None:
+        """
+        Send a snapshot to every consumer. Must be called on the server's loop.
+        """
+        self.latest = snapshot
+        for writer in list(self.writers):
+            self._send(writer, snapshot)
+
+    def _send(self, writer: asyncio.StreamWriter, snapshot) -> None:
+        if writer.transport.get_write_buffer_size() > IPC_MAX_BUFFER:
+            logger.warning("Dropping snapshot stream consumer that is not keeping up")
+            self.writers.discard(writer)
+            writer.close()
+            return
+        writer.write(snapshot.json_bytes + b"\n")
+        self.messages_sent += 1
+
+    async def _handle_consumer(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.writers.add(writer)
+        logger.info(f"Snapshot stream consumer connected ({len(self.writers)} total)")
+        try:
+            # Resync the new consumer straight away
+            if self.latest is not None:
+                self._send(writer, self.latest)
+            # Consumers never send anything; this returns when they disconnect
+            await reader.read()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self.writers.discard(writer)
+            writer.close()
+            logger.info(f"Snapshot stream consumer disconnected ({len(self.writers)} left)")
+
+
+async def read_snapshot_stream(path: str = IPC_SOCKET_PATH) -> AsyncIterator[Any]:
+    """
+    Connect to the bot's snapshot stream and yield each decoded snapshot
+    ({"timestamp", "version", "matches"}) until the bot closes the stream.
+    Raises OSError if the socket is not available.
+    """
+    reader, writer = await asyncio.open_unix_connection(path, limit=IPC_MAX_MESSAGE)
+    logger.info(f"Connected to snapshot stream at {path}")
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                logger.error(f"Skipping undecodable snapshot message: {e}")
+    finally:
+        writer.close()
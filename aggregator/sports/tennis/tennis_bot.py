@@ -8,14 +8,20 @@ from typing import Optional, Dict
 from datetime import datetime, timedelta
 import pytz
 import threading
-from fastapi import FastAPI, WebSocket
-from fastapi.middleware.cors import CORSMiddleware
-import uvicorn
 
 # Using absolute imports
+from aggregator.sports.tennis import betsapi_prematch, rapid_tennis_fetcher
 from aggregator.sports.tennis.betsapi_prematch import BetsapiPrematch
 from aggregator.sports.tennis.rapid_tennis_fetcher import RapidInplayOddsFetcher
 from aggregator.sports.tennis.tennis_merger import TennisMerger
+from aggregator.sports.tennis.metrics import CONTENT_TYPE, REGISTRY, STAGE_SECONDS
+from aggregator.sports.tennis.snapshot import EMPTY_SNAPSHOT, TennisSnapshot
+from aggregator.sports.tennis.snapshot_file import atomic_write, load_json_file
+from aggregator.sports.tennis.snapshot_stream import IPC_SOCKET_PATH, SnapshotStreamServer
+from aggregator.sports.tennis.tracing import CYCLE_TRACES, span
+from aggregator.sports.tennis.ws_encoding import (
+    FrameEncoder, build_heartbeat_frame, negotiate_encoding, send_frame
+)
 
 ###############################################################################
 # Configuration via Environment Variables or defaults
@@ -24,38 +30,106 @@ DEFAULT_CONCURRENCY = int(os.getenv("TENNIS_BOT_CONCURRENCY", "5"))
 DEFAULT_MAX_RETRIES = int(os.getenv("TENNIS_BOT_MAX_RETRIES", "3"))
 DEFAULT_FETCH_INTERVAL = float(os.getenv("TENNIS_BOT_FETCH_INTERVAL", "60"))
 COUNTER_FILE = "tennis_bot_counters.json"
+# The last published snapshot is checkpointed here so a restarted bot serves
+# it (under the same version) until its first cycle completes ("" disables)
+CHECKPOINT_FILE = os.getenv("TENNIS_BOT_CHECKPOINT", "tennis_bot_checkpoint.json")
+CHECKPOINT_INTERVAL = float(os.getenv("TENNIS_BOT_CHECKPOINT_INTERVAL", "60"))
+CHECKPOINT_MAX_AGE = float(os.getenv("TENNIS_BOT_CHECKPOINT_MAX_AGE", "21600"))
+WS_HEARTBEAT_INTERVAL = float(os.getenv("TENNIS_BOT_WS_HEARTBEAT_INTERVAL", "15"))
+WS_PING_INTERVAL = float(os.getenv("TENNIS_BOT_WS_PING_INTERVAL", "20"))
 
 ###############################################################################
 # Global Variables
 ###############################################################################
-# Store the latest merged data globally to share between TennisBot and FastAPI
-latest_tennis_data = []
+# The latest merged data, shared between TennisBot and the FastAPI thread.
+# Only ever replaced as a whole by publish_snapshot(), never modified.
+latest_snapshot = EMPTY_SNAPSHOT
+
+# Pushes every published snapshot to main_api (None if the IPC stream is disabled)
+snapshot_stream = None
+# Called with every published snapshot, on the bot's event loop (used by embedded mode)
+snapshot_listeners = []
+# Fetch cycles completed since start; /api/health reports ready after the first
+cycles_completed = 0
+# When the latest snapshot was installed, for the snapshot age metric
+snapshot_installed_at = time.time()
+
+REGISTRY.gauge("tennis_bot_live_matches", "Matches in the latest snapshot").set_function(
+    lambda: len(latest_snapshot)
+)
+REGISTRY.gauge("tennis_bot_snapshot_age_seconds", "Seconds since the latest snapshot was published").set_function(
+    lambda: time.time() - snapshot_installed_at
+)
+REGISTRY.gauge("tennis_bot_snapshot_version", "Version of the latest snapshot").set_function(
+    lambda: latest_snapshot.version
+)
+REGISTRY.gauge("tennis_bot_cycles_completed", "Fetch cycles completed since start").set_function(
+    lambda: cycles_completed
+)
+
+# Encodes the latest snapshot once per encoding for all /ws clients
+ws_frame_encoder = FrameEncoder()
+ws_frame_source = {"snapshot": None, "text": ""}
 
 ###############################################################################
 # Logging Configuration
 ###############################################################################
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
-
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.INFO)
 
-# Set eastern timezone for logging
-eastern_tz = pytz.timezone('US/Eastern')
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s', 
-                              datefmt='%Y-%m-%d %H:%M:%S')
-formatter.converter = lambda *args: datetime.now(eastern_tz).timetuple()
-console_handler.setFormatter(formatter)
-
-file_handler = logging.FileHandler("tennis_bot.log", mode='a')
-file_handler.setLevel(logging.INFO)
-file_handler.setFormatter(formatter)
+def setup_logging() -> None:
+    """
+    Log to the console and tennis_bot.log (with the fetchers' own handlers).
+    Called by the entry points rather than at import time, so importing the
+    bot opens no files; safe to call more than once.
+    """
+    betsapi_prematch.setup_logging()
+    rapid_tennis_fetcher.setup_logging()
+    # Avoid adding handlers multiple times
+    if logger.handlers:
+        return
+    logger.setLevel(logging.INFO)
+
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+
+    # Set eastern timezone for logging
+    eastern_tz = pytz.timezone('US/Eastern')
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s', 
+                                  datefmt='%Y-%m-%d %H:%M:%S')
+    formatter.converter = lambda *args: datetime.now(eastern_tz).timetuple()
+    console_handler.setFormatter(formatter)
+
+    file_handler = logging.FileHandler("tennis_bot.log", mode='a')
+    file_handler.setLevel(logging.INFO)
+    file_handler.setFormatter(formatter)
 
-# Avoid adding handlers multiple times
-if not logger.handlers:
     logger.addHandler(console_handler)
     logger.addHandler(file_handler)
 
+def publish_snapshot(matches) -> TennisSnapshot:
+    """
+    Freeze a cycle's merged matches into the next snapshot and make it the
+    latest with a single reference swap.
+    """
+    return install_snapshot(TennisSnapshot(latest_snapshot.version + 1, datetime.now().isoformat(), matches))
+
+def install_snapshot(snapshot: TennisSnapshot) -> TennisSnapshot:
+    """
+    Make a snapshot the latest and hand it to the IPC stream and listeners.
+    """
+    global latest_snapshot, snapshot_installed_at
+    latest_snapshot = snapshot
+    snapshot_installed_at = time.time()
+    if snapshot_stream is not None:
+        with span("ipc_publish", consumers=len(snapshot_stream.writers)):
+            snapshot_stream.publish(snapshot)
+    for listener in snapshot_listeners:
+        try:
+            listener(snapshot)
+        except Exception as e:
+            logger.error(f"Error in snapshot listener: {e}")
+    return snapshot
+
 ###############################################################################
 # Graceful Shutdown Setup
 ###############################################################################
@@ -113,14 +187,15 @@ class TennisBot:
         )
         self.rapid_fetcher = RapidInplayOddsFetcher()
 
-        # Load or initialize counters for API calls
-        self.load_counters()
+        # Load or initialize counters for API calls, and the windows they count
         est = pytz.timezone('America/New_York')
         now = datetime.now(est)
         self.last_reset_date = now.date()
         self.last_reset_month = now.month
         self.last_reset_hour = now.hour
+        self.load_counters()
         self.last_fetch_time = time.time()
+        self.last_checkpoint_time = time.time()
 
     def load_counters(self) -> None:
         """Load counters from file or initialize new ones if file doesn't exist"""
@@ -131,6 +206,11 @@ class TennisBot:
                 self.hourly_total_calls = data.get('hourly_total_calls', {'betsapi': 0, 'rapidapi': 0})
                 self.daily_total_calls = data.get('daily_total_calls', {'betsapi': 0, 'rapidapi': 0})
                 self.monthly_total_calls = data.get('monthly_total_calls', {'betsapi': 0, 'rapidapi': 0})
+                # Restore the windows too, so a restart in a new hour/day/month still resets them
+                if 'last_reset_date' in data:
+                    self.last_reset_date = datetime.strptime(data['last_reset_date'], '%Y-%m-%d').date()
+                    self.last_reset_month = data.get('last_reset_month', self.last_reset_month)
+                    self.last_reset_hour = data.get('last_reset_hour', self.last_reset_hour)
                 logger.info("Loaded persisted counters from file")
         except FileNotFoundError:
             logger.info("No persisted counters found, initializing new ones")
@@ -144,10 +224,45 @@ class TennisBot:
             'current_cycle_calls': self.current_cycle_calls,
             'hourly_total_calls': self.hourly_total_calls,
             'daily_total_calls': self.daily_total_calls,
-            'monthly_total_calls': self.monthly_total_calls
+            'monthly_total_calls': self.monthly_total_calls,
+            'last_reset_date': self.last_reset_date.isoformat(),
+            'last_reset_month': self.last_reset_month,
+            'last_reset_hour': self.last_reset_hour
         }
-        with open(COUNTER_FILE, 'w') as f:
-            json.dump(data, f)
+        atomic_write(COUNTER_FILE, json.dumps(data).encode())
+
+    def restore_checkpoint(self) -> bool:
+        """
+        Warm restart: install the last checkpointed snapshot, under its own
+        version, so the API, IPC stream and listeners have data immediately
+        and versions keep increasing. Returns True if one was restored.
+        """
+        if not CHECKPOINT_FILE or latest_snapshot is not EMPTY_SNAPSHOT:
+            return False
+        data = load_json_file(CHECKPOINT_FILE, CHECKPOINT_MAX_AGE)
+        snapshot = (data or {}).get("snapshot")
+        if not isinstance(snapshot, dict) or not isinstance(snapshot.get("matches"), list):
+            return False
+        install_snapshot(TennisSnapshot(int(snapshot.get("version") or 0), snapshot.get("timestamp"), snapshot["matches"]))
+        logger.info(f"Warm restart: restored snapshot version {latest_snapshot.version} "
+                    f"with {len(latest_snapshot)} matches from {CHECKPOINT_FILE}")
+        return True
+
+    def write_checkpoint(self, snapshot: TennisSnapshot) -> None:
+        """Write a snapshot to CHECKPOINT_FILE, reusing its serialized body"""
+        if snapshot is EMPTY_SNAPSHOT:
+            return
+        atomic_write(CHECKPOINT_FILE, b'{"saved_at": %.3f, "snapshot": %s}' % (time.time(), snapshot.json_bytes))
+        self.last_checkpoint_time = time.time()
+
+    async def checkpoint_if_due(self) -> None:
+        """Checkpoint the latest snapshot every CHECKPOINT_INTERVAL seconds, off the event loop"""
+        if not CHECKPOINT_FILE or time.time() - self.last_checkpoint_time < CHECKPOINT_INTERVAL:
+            return
+        try:
+            await asyncio.to_thread(self.write_checkpoint, latest_snapshot)
+        except Exception as e:
+            logger.error(f"Error writing checkpoint: {e}")
 
     def reset_hourly_counters(self) -> None:
         est = pytz.timezone('America/New_York')
@@ -176,10 +291,14 @@ class TennisBot:
         self.current_cycle_calls = {'betsapi': 0, 'rapidapi': 0}
 
     async def run(self) -> None:
+        global cycles_completed
         logger.info("TennisBot started. Press Ctrl+C to stop.")
+        self.restore_checkpoint()
         try:
             while True:
                 start_time = time.time()
+                # Spans of this cycle, see /debug/cycles
+                cycle = CYCLE_TRACES.begin("cycle", source="bot")
                 logger.info("Starting fetch cycle...")
                 self.reset_cycle_counters()
                 self.reset_hourly_counters()
@@ -189,7 +308,9 @@ class TennisBot:
                 # 1) Fetch data from BetsAPI
                 logger.info("[BetsAPI] Beginning fetch...")
                 bets_start_time = time.time()
-                bets_data = await self.betsapi_fetcher.get_tennis_data()
+                with span("betsapi") as fetch_span:
+                    bets_data = await self.betsapi_fetcher.get_tennis_data()
+                    fetch_span.set(records=len(bets_data))
                 bets_elapsed = time.time() - bets_start_time
                 self.current_cycle_calls['betsapi'] = len(bets_data)
                 self.hourly_total_calls['betsapi'] += len(bets_data)
@@ -200,7 +321,9 @@ class TennisBot:
                 # 2) Fetch data from RapidAPI
                 logger.info("[RapidAPI] Beginning fetch...")
                 rapid_start_time = time.time()
-                rapid_data = await self.rapid_fetcher.get_tennis_data()
+                with span("rapidapi") as fetch_span:
+                    rapid_data = await self.rapid_fetcher.get_tennis_data()
+                    fetch_span.set(records=len(rapid_data))
                 rapid_elapsed = time.time() - rapid_start_time
                 self.current_cycle_calls['rapidapi'] = len(rapid_data)
                 self.hourly_total_calls['rapidapi'] += len(rapid_data)
@@ -215,8 +338,11 @@ class TennisBot:
                 logger.info("Merging data...")
                 merge_start_time = time.time()
                 merger = TennisMerger()
-                merged_data = merger.merge(bets_data, rapid_data)
+                with span("merge") as merge_span:
+                    merged_data = merger.merge(bets_data, rapid_data)
+                    merge_span.set(matches=len(merged_data))
                 merge_elapsed = time.time() - merge_start_time
+                STAGE_SECONDS.observe(merge_elapsed, "merge", "bot")
                 stats = merger.get_match_stats()
                 total_elapsed = time.time() - start_time
                 logger.info("\nAPI AND MATCH STATISTICS:")
@@ -270,15 +396,17 @@ class TennisBot:
                             bet365_id = match['betsapi_data'].get('bet365_id', '')
                             logger.info(f"  {home} vs {away} (Bet365Id: {bet365_id})")
 
-                # Update with the latest merged data
-                global latest_tennis_data
-                latest_tennis_data = merged_data
-
-                message = {
-                    "type": "match_data",
-                    "matches": merged_data
-                }
-                message_json = json.dumps(message)
+                # Publish the latest merged data
+                with span("publish") as publish_span:
+                    snapshot = publish_snapshot(merged_data)
+                    # /ws clients pick the snapshot up on their next poll and find this cycle by version
+                    cycle.set(version=snapshot.version)
+                    publish_span.set(version=snapshot.version, matches=len(snapshot))
+                cycles_completed += 1
+                STAGE_SECONDS.observe(time.time() - start_time, "cycle", "bot")
+                with span("checkpoint"):
+                    await self.checkpoint_if_due()
+                CYCLE_TRACES.end(cycle)
 
                 elapsed = time.time() - self.last_fetch_time
                 wait_time = max(0, self.fetch_interval - elapsed)
@@ -289,6 +417,8 @@ class TennisBot:
         except asyncio.CancelledError:
             logger.warning("Fetch loop cancelled. Exiting gracefully.")
             self.save_counters()
+            if CHECKPOINT_FILE:
+                self.write_checkpoint(latest_snapshot)
             raise
         except Exception as e:
             logger.error("Error in TennisBot run loop", exc_info=True)
@@ -301,6 +431,7 @@ class TennisBot:
         Runs a single data fetch cycle and returns the merged results.
         """
         start_time = time.time()
+        cycle = CYCLE_TRACES.begin("cycle", source="bot")
         logger.info(f"Starting fetch cycle at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
         # Reset cycle counters
@@ -327,7 +458,8 @@ class TennisBot:
         logger.info("Fetching prematch data from BetsAPI...")
         bets_data = []
         try:
-            bets_data = await self.betsapi_fetcher.get_tennis_data()
+            with span("betsapi"):
+                bets_data = await self.betsapi_fetcher.get_tennis_data()
             self.current_cycle_calls['betsapi'] = len(bets_data)
             self.hourly_total_calls['betsapi'] += len(bets_data)
             self.daily_total_calls['betsapi'] += len(bets_data)
@@ -339,7 +471,8 @@ class TennisBot:
         logger.info("Fetching in-play odds from RapidAPI...")
         rapid_data = []
         try:
-            rapid_data = await self.rapid_fetcher.get_tennis_data()
+            with span("rapidapi"):
+                rapid_data = await self.rapid_fetcher.get_tennis_data()
             self.current_cycle_calls['rapidapi'] = len(rapid_data)
             self.hourly_total_calls['rapidapi'] += len(rapid_data)
             self.daily_total_calls['rapidapi'] += len(rapid_data)
@@ -353,7 +486,8 @@ class TennisBot:
         if bets_data and rapid_data:
             try:
                 merger = TennisMerger()
-                merged_data = merger.merge(bets_data, rapid_data)
+                with STAGE_SECONDS.time("merge", "bot"), span("merge"):
+                    merged_data = merger.merge(bets_data, rapid_data)
                 
                 if merged_data and len(merged_data) > 0:
                     sample = merged_data[0]
@@ -380,19 +514,9 @@ class TennisBot:
                 logger.info(f"Merger results: {len(merged_data)} total matches " +
                            f"({len(bets_data)} from BetsAPI, {len(rapid_data)} from RapidAPI)")
                 
-                # Store data globally to make available to FastAPI
-                global latest_tennis_data
-                latest_tennis_data = merged_data
-                
-                # Create response message
-                message = {
-                    "type": "match_data",
-                    "matches": merged_data
-                }
-                message_json = json.dumps(message)
-
-                # Store data globally to make available to FastAPI
-                latest_tennis_data = message
+                # Publish the data to make it available to FastAPI
+                with span("publish"):
+                    cycle.set(version=publish_snapshot(merged_data).version)
                 
             except Exception as e:
                 logger.error(f"Error in data merging: {e}")
@@ -426,6 +550,7 @@ class TennisBot:
         cycle_time = self.last_fetch_time - start_time
         sleep_time = max(0, self.fetch_interval - cycle_time)
         logger.info(f"Fetch cycle complete. Sleeping for {sleep_time:.2f} seconds.")
+        CYCLE_TRACES.end(cycle, matches=len(merged_data))
         
         # Return the merged data
         return merged_data
@@ -433,51 +558,109 @@ class TennisBot:
 ###############################################################################
 # FastAPI app for serving data directly to frontend
 ###############################################################################
-app = FastAPI()
-
-# Add CORS to allow requests from your frontend
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # For development only, restrict this in production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+def encode_snapshot_frame(snapshot: TennisSnapshot, encoding: str):
+    """
+    Return a snapshot as a /ws frame in the given encoding.
+    Each encoding is only produced once per snapshot.
+    """
+    if ws_frame_source["snapshot"] is not snapshot:
+        ws_frame_encoder.reset()
+        ws_frame_source["snapshot"] = snapshot
+        ws_frame_source["text"] = snapshot.json_bytes.decode()
+    return ws_frame_encoder.encode(("snapshot", snapshot.version), ws_frame_source["text"], encoding)
 
-# WebSocket endpoint
-@app.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
-    await websocket.accept()
-    try:
-        while True:
-            # Send the latest data every time it's updated
-            global latest_tennis_data
-            if latest_tennis_data:
-                await websocket.send_json({
-                    "timestamp": datetime.now().isoformat(),
-                    "matches": latest_tennis_data
-                })
-            # Wait for a moment to prevent overwhelming the client
-            await asyncio.sleep(1)
-    except Exception as e:
-        logger.error(f"WebSocket error: {e}")
-    finally:
-        await websocket.close()
-
-# REST endpoint alternative
-@app.get("/api/tennis")
-async def get_tennis_data():
-    global latest_tennis_data
-    return {
-        "timestamp": datetime.now().isoformat(),
-        "matches": latest_tennis_data
-    }
+def create_app():
+    """
+    Build the bot's API. FastAPI is only imported here, so fetch-only and
+    embedded uses of the bot never load it.
+    """
+    from fastapi import FastAPI, Response, WebSocket
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.responses import JSONResponse
+
+    app = FastAPI()
+
+    # Add CORS to allow requests from your frontend
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # For development only, restrict this in production
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # WebSocket endpoint
+    @app.websocket("/ws")
+    async def websocket_endpoint(websocket: WebSocket):
+        await websocket.accept()
+        encoding = negotiate_encoding(websocket.query_params.get("encoding", ""))
+        last_sent_snapshot = None
+        last_sent_time = time.time()
+        try:
+            while True:
+                # Read the shared reference once; the snapshot itself never changes
+                snapshot = latest_snapshot
+                # Send the latest data only when it has been replaced since our last send
+                if snapshot.matches and snapshot is not last_sent_snapshot:
+                    last_sent_snapshot = snapshot
+                    # Recorded in the trace of the cycle that published the snapshot
+                    send_span = CYCLE_TRACES.find("cycle", source="bot", version=snapshot.version).child(
+                        "ws_send", {"encoding": encoding}
+                    )
+                    frame = encode_snapshot_frame(snapshot, encoding)
+                    await send_frame(websocket, frame)
+                    send_span.finish(bytes=len(frame))
+                    last_sent_time = time.time()
+                # Otherwise just let an idle client know which version is current
+                elif time.time() - last_sent_time > WS_HEARTBEAT_INTERVAL:
+                    heartbeat = ws_frame_encoder.encode(
+                        ("heartbeat", snapshot.version), build_heartbeat_frame(snapshot.version), encoding
+                    )
+                    await send_frame(websocket, heartbeat)
+                    last_sent_time = time.time()
+                # Checking for new data is a reference comparison, so this is cheap
+                await asyncio.sleep(1)
+        except Exception as e:
+            logger.error(f"WebSocket error: {e}")
+        finally:
+            await websocket.close()
+
+    @app.get("/api/health")
+    async def get_health():
+        """Readiness probe: 200 once a fetch cycle has completed since start, 503 until then"""
+        return JSONResponse(
+            status_code=200 if cycles_completed else 503,
+            content={"ready": cycles_completed > 0, "cycles": cycles_completed, "version": latest_snapshot.version}
+        )
+
+    @app.get("/metrics")
+    async def get_metrics():
+        """Prometheus text exposition of the bot's metrics"""
+        return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
+
+    @app.get("/debug/cycles")
+    async def get_debug_cycles(limit: Optional[int] = None):
+        """Span trees of the most recent fetch cycles, newest first"""
+        return {"tracing": CYCLE_TRACES.get_stats(), "cycles": CYCLE_TRACES.to_list(limit)}
+
+    @app.get("/api/ws/stats")
+    async def get_websocket_stats():
+        return {"encodings": ws_frame_encoder.get_stats()}
+
+    # REST endpoint alternative
+    @app.get("/api/tennis")
+    async def get_tennis_data():
+        # The body was serialized when the snapshot was published
+        return Response(content=latest_snapshot.json_bytes, media_type="application/json")
+
+    return app
 
 # Function to start the API server
 def start_api_server():
     try:
+        import uvicorn
         logger.info("Starting API server on port 8000")
-        uvicorn.run(app, host="0.0.0.0", port=8000)
+        uvicorn.run(create_app(), host="0.0.0.0", port=8000, ws_ping_interval=WS_PING_INTERVAL)
     except Exception as e:
         logger.error(f"Error starting API server: {e}")
 
@@ -488,6 +671,7 @@ async def main() -> None:
     """
     Sets up graceful shutdown handlers, then runs the TennisBot indefinitely.
     """
+    setup_logging()
     pid_file = "/tmp/tennis_bot.pid"
     try:
         with open(pid_file, 'x') as f:
@@ -505,6 +689,15 @@ async def main() -> None:
     loop = asyncio.get_event_loop()
     for sig in (signal.SIGINT, signal.SIGTERM):
         loop.add_signal_handler(sig, lambda: shutdown_handler(loop))
+    # Push snapshots to main_api over a Unix socket (TENNIS_BOT_IPC_SOCKET="" disables it)
+    global snapshot_stream
+    if IPC_SOCKET_PATH:
+        try:
+            snapshot_stream = SnapshotStreamServer(IPC_SOCKET_PATH)
+            await snapshot_stream.start()
+        except OSError as e:
+            logger.error(f"Could not start snapshot stream on {IPC_SOCKET_PATH}: {e}")
+            snapshot_stream = None
     bot = TennisBot()
     api_thread = threading.Thread(target=start_api_server)
     api_thread.daemon = True  # Allow the thread to exit when main thread exits
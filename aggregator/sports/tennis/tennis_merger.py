@@ -4,6 +4,8 @@ from typing import List, Dict, Any, Optional
 from rapidfuzz import fuzz
 from datetime import datetime
 
+from aggregator.sports.tennis.tracing import start_span
+
 logger = logging.getLogger(__name__)
 
 class TennisMerger:
@@ -235,6 +237,7 @@ class TennisMerger:
         self.merged_matches = {}
         
         # Process pre-match data first
+        index_span = start_span("index_prematch", records=len(prematch_data))
         for match in prematch_data:
             if not match:
                 continue
@@ -253,8 +256,12 @@ class TennisMerger:
                 'match_id': match_id,
                 'betsapi_data': match
             }
+        index_span.finish(matches=len(self.merged_matches))
 
-        # Update with live data where available
+        # Update with live data where available; the trace records how many
+        # events each strategy matched, and times every fuzzy search
+        strategies = {"bet365_id": 0, "market_fi": 0, "fuzzy_name": 0, "unmatched": 0}
+        live_span = start_span("match_live", records=len(live_data))
         for match in live_data:
             if not match or not match.get('raw_event_data'):
                 continue
@@ -270,12 +277,14 @@ class TennisMerger:
             if extracted_bet365_id and extracted_bet365_id in self.merged_matches:
                 logger.info(f"Found match by extracted bet365_id {extracted_bet365_id} from eventId {event_id}")
                 self.merged_matches[extracted_bet365_id]['rapid_data'] = match
+                strategies["bet365_id"] += 1
                 continue
                 
             # Second try: Check if marketFI matches any existing IDs
             if market_fi and market_fi in self.merged_matches:
                 logger.info(f"Found match by marketFI {market_fi}")
                 self.merged_matches[market_fi]['rapid_data'] = match
+                strategies["market_fi"] += 1
                 continue
             
             # Final try: Fall back to fuzzy name matching
@@ -283,6 +292,7 @@ class TennisMerger:
             away_name = str(raw_event.get('team2', ''))
             
             found_match = False
+            fuzzy_span = live_span.child("fuzzy_match", {"event_id": event_id})
             for existing_id, existing_match in self.merged_matches.items():
                 if not existing_match.get('rapid_data'):  # Only look at unmatched BetsAPI events
                     bets_data = existing_match['betsapi_data']
@@ -293,8 +303,12 @@ class TennisMerger:
                         self.merged_matches[existing_id]['rapid_data'] = match
                         found_match = True
                         break
+            fuzzy_span.finish(matched=found_match)
             
-            if not found_match:
+            if found_match:
+                strategies["fuzzy_name"] += 1
+            else:
+                strategies["unmatched"] += 1
                 # Log detailed information about the unmatched event
                 if extracted_bet365_id:
                     logger.info(f"Event with extracted bet365_id {extracted_bet365_id} from eventId {event_id} not found in BetsAPI data")
@@ -309,6 +323,7 @@ class TennisMerger:
                         'rapid_data': match,
                         'betsapi_data': None
                     }
+        live_span.finish(**strategies)
         
         return list(self.merged_matches.values())
 
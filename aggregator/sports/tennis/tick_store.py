@@ -0,0 +1,254 @@
+"""
+Odds Tick Store for Tennis Bot
+
+Keeps the price history of every (match, market, selection) in memory as two
+typed arrays per series: Unix timestamps (uint32) and prices as integer ticks
+of 1/1000 (int32), i.e. 8 bytes per tick instead of a dict of strings per
+observation. A tick is only appended when the price actually moved, appends
+are amortized O(1), and all series of a match are dropped together when the
+match ends.
+
+Prices come from the RapidAPI in-play markets (raw_odds_data) and the BetsAPI
+prematch odds (raw_prematch_data) of each updated match.
+"""
+
+import logging
+from array import array
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from aggregator.sports.tennis.match_views import iter_selections
+
+logger = logging.getLogger(__name__)
+
+PRICE_SCALE = 1000  # Ticks per unit of decimal odds
+PREMATCH_PREFIX = "prematch:"
+
+
+def parse_price(value: Any) -> Optional[float]:
+    """
+    Decimal odds from a number, a decimal string ("1.83") or a fractional
+    string ("5/6"). Returns None for anything else.
+    """
+    if isinstance(value, (int, float)):
+        price = float(value)
+    elif isinstance(value, str):
+        value = value.strip()
+        try:
+            if "/" in value:
+                numerator, denominator = value.split("/", 1)
+                price = 1 + float(numerator) / float(denominator)
+            else:
+                price = float(value)
+        except (ValueError, ZeroDivisionError):
+            return None
+    else:
+        return None
+    return price if price > 0 else None
+
+
+def to_ticks(price: float) -> int:
+    return int(round(price * PRICE_SCALE))
+
+
+def from_ticks(ticks: int) -> float:
+    return ticks / PRICE_SCALE
+
+
+def iter_rapid_prices(match: Dict[str, Any]) -> Iterator[Tuple[str, str, float]]:
+    """
+    Yield (market, selection, price) for the RapidAPI in-play markets of a match.
+    """
+    raw_odds_data = (match.get("rapid_data") or {}).get("raw_odds_data") or {}
+    markets = raw_odds_data.get("markets") or []
+    items = markets.items() if isinstance(markets, dict) else ((None, market) for market in markets)
+    for market_id, market in items:
+        if not isinstance(market, dict):
+            continue
+        market_name = str(market.get("name") or market.get("id") or market_id or market.get("group") or "")
+        for selection in iter_selections(market):
+            price = parse_price(selection.get("odds", selection.get("price")))
+            if price is not None:
+                yield market_name, str(selection.get("name", "")), price
+
+
+def iter_prematch_prices(match: Dict[str, Any]) -> Iterator[Tuple[str, str, float]]:
+    """
+    Yield (market, selection, price) for the Bet365 prematch odds of a match,
+    found in any section's "sp" markets of raw_prematch_data.
+    """
+    raw = (match.get("betsapi_data") or {}).get("raw_prematch_data") or []
+    results = raw if isinstance(raw, list) else [raw]
+    for result in results:
+        if not isinstance(result, dict):
+            continue
+        for section in result.values():
+            markets = section.get("sp") if isinstance(section, dict) else None
+            if not isinstance(markets, dict):
+                continue
+            for market_key, market in markets.items():
+                if not isinstance(market, dict) or not isinstance(market.get("odds"), list):
+                    continue
+                for selection in market["odds"]:
+                    if not isinstance(selection, dict):
+                        continue
+                    price = parse_price(selection.get("odds"))
+                    name = selection.get("name") or selection.get("header") or selection.get("id")
+                    if price is not None and name is not None:
+                        yield f"{PREMATCH_PREFIX}{market_key}", str(name), price
+
+
+class TickSeries:
+    """
+    Price ticks of one selection: parallel arrays of timestamps and prices.
+    """
+
+    __slots__ = ("times", "prices")
+
+    def __init__(self):
+        self.times = array("I")
+        self.prices = array("i")
+
+    def append(self, ts: int, price_ticks: int) -> bool:
+        """
+        Append a tick unless the price is unchanged. Returns True if appended.
+        """
+        if self.prices and self.prices[-1] == price_ticks:
+            return False
+        self.times.append(ts)
+        self.prices.append(price_ticks)
+        return True
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.times) * self.times.itemsize + len(self.prices) * self.prices.itemsize
+
+    def last(self) -> Optional[Tuple[int, float]]:
+        if not self.prices:
+            return None
+        return self.times[-1], from_ticks(self.prices[-1])
+
+
+class TickStore:
+    """
+    All tick series, grouped per match so a finished match is evicted at once.
+    """
+
+    def __init__(self):
+        self.matches: Dict[str, Dict[Tuple[str, str], TickSeries]] = {}
+        self.ticks = 0
+        self.evicted_ticks = 0
+        # Called as listener(match_id, market, selection, ts, price_ticks) for every new tick
+        self.tick_listeners: List[Callable[[str, str, str, int, int], None]] = []
+
+    def record_match(self, match: Dict[str, Any], ts: float) -> int:
+        """
+        Append the current prices of one match. Returns the number of new ticks.
+        """
+        match_id = str(match.get("match_id"))
+        series_by_key = self.matches.setdefault(match_id, {})
+        ts = int(ts)
+        appended = 0
+        for source in (iter_rapid_prices, iter_prematch_prices):
+            for market, selection, price in source(match):
+                series = series_by_key.get((market, selection))
+                if series is None:
+                    series = series_by_key[(market, selection)] = TickSeries()
+                price_ticks = to_ticks(price)
+                if series.append(ts, price_ticks):
+                    appended += 1
+                    for listener in self.tick_listeners:
+                        listener(match_id, market, selection, ts, price_ticks)
+        self.ticks += appended
+        return appended
+
+    def update(self, matches: List[Dict[str, Any]], ts: float) -> int:
+        """
+        Record every (changed) match of an update. Returns the number of new ticks.
+        """
+        return sum(self.record_match(match, ts) for match in matches if match.get("match_id"))
+
+    def evict_match(self, match_id: str) -> int:
+        """
+        Drop all series of a match that ended. Returns the number of ticks freed.
+        """
+        series_by_key = self.matches.pop(str(match_id), None)
+        if not series_by_key:
+            return 0
+        freed = sum(len(series) for series in series_by_key.values())
+        self.ticks -= freed
+        self.evicted_ticks += freed
+        return freed
+
+    def find_series(self, match_id: str, selection: str, market: Optional[str] = None) -> List[Tuple[str, TickSeries]]:
+        """
+        The (market, series) pairs of a match for a selection name, optionally
+        restricted to one market.
+        """
+        return [
+            (series_market, series)
+            for (series_market, series_selection), series in self.matches.get(str(match_id), {}).items()
+            if series_selection == selection and (market is None or series_market == market)
+        ]
+
+    def describe_match(self, match_id: str) -> List[Dict[str, Any]]:
+        """
+        One row per series of a match: market, selection, tick count and last price.
+        """
+        rows = []
+        for (market, selection), series in self.matches.get(str(match_id), {}).items():
+            last = series.last()
+            rows.append({
+                "market": market,
+                "selection": selection,
+                "ticks": len(series),
+                "last_update": last[0] if last else None,
+                "last_price": last[1] if last else None
+            })
+        return rows
+
+    def get_stats(self) -> Dict[str, Any]:
+        data_bytes = sum(
+            series.nbytes for series_by_key in self.matches.values() for series in series_by_key.values()
+        )
+        return {
+            "matches": len(self.matches),
+            "series": sum(len(series_by_key) for series_by_key in self.matches.values()),
+            "ticks": self.ticks,
+            "evicted_ticks": self.evicted_ticks,
+            "data_bytes": data_bytes,
+            "bytes_per_tick": data_bytes / self.ticks if self.ticks else 0
+        }
+
+
+if __name__ == "__main__":
+    # Quick benchmark: a day of 60s cycles for 100 matches with 20 moving selections each
+    import random
+    import sys
+    import time
+
+    store = TickStore()
+    start_time = time.time()
+    start = time.perf_counter()
+    for cycle in range(1440):
+        matches = [{
+            "match_id": f"m{m}",
+            "rapid_data": {"raw_odds_data": {"markets": {
+                str(k): {"name": f"Market {k}", "selections": {
+                    "home": {"odds": round(random.uniform(1.01, 10), 2)},
+                    "away": {"odds": round(random.uniform(1.01, 10), 2)}
+                }} for k in range(10)
+            }}}
+        } for m in range(100)]
+        store.update(matches, start_time + cycle * 60)
+    elapsed = time.perf_counter() - start
+    stats = store.get_stats()
+    series_overhead = sum(
+        sys.getsizeof(series.times) + sys.getsizeof(series.prices)
+        for series_by_key in store.matches.values() for series in series_by_key.values()
+    )
+    print(f"{stats['ticks']} ticks in {stats['series']} series, {elapsed:.1f}s to record")
+    print(f"{stats['bytes_per_tick']:.1f} data bytes per tick, "
+          f"{series_overhead / stats['ticks']:.1f} bytes per tick including array overhead")
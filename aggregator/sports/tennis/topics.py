@@ -0,0 +1,164 @@
+"""
+WebSocket Topics for Tennis Bot
+
+Clients connected to /ws can narrow what they receive by subscribing to topics
+instead of getting every match on every update:
+
+  - "all"                 every full match record (default for clients that never subscribe)
+  - "summary"             compact list-view rows for every match
+  - "match:<match_id>"    the full record of a single match
+  - "tournament:<name>"   the full records of every match in one tournament
+
+The TopicIndex keeps a subscriber set per topic so a broadcast only renders
+the topics somebody is listening to, and each client only receives its own.
+"""
+
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from aggregator.sports.tennis.match_views import get_tournament_name, summarize_match
+
+logger = logging.getLogger(__name__)
+
+ALL_TOPIC = "all"
+SUMMARY_TOPIC = "summary"
+MATCH_PREFIX = "match:"
+TOURNAMENT_PREFIX = "tournament:"
+
+
+def is_valid_topic(topic: Any) -> bool:
+    """
+    Check that a client-supplied topic is one of the supported forms.
+    """
+    if not isinstance(topic, str):
+        return False
+    if topic in (ALL_TOPIC, SUMMARY_TOPIC):
+        return True
+    for prefix in (MATCH_PREFIX, TOURNAMENT_PREFIX):
+        if topic.startswith(prefix) and len(topic) > len(prefix):
+            return True
+    return False
+
+
+def parse_topics(raw: Any) -> List[str]:
+    """
+    Parse topics from a comma separated query string value or a JSON list,
+    dropping anything that is not a valid topic.
+    """
+    if isinstance(raw, str):
+        raw = raw.split(",")
+    if not isinstance(raw, list):
+        return []
+
+    topics = []
+    for topic in raw:
+        topic = topic.strip() if isinstance(topic, str) else topic
+        if is_valid_topic(topic):
+            topics.append(topic)
+        else:
+            logger.debug(f"Ignoring invalid topic: {topic!r}")
+    return topics
+
+
+class TopicIndex:
+    """
+    Per-topic subscriber index: topic -> set of client IDs, plus the reverse
+    client ID -> set of topics so a disconnect can be cleaned up in O(topics).
+    """
+
+    def __init__(self):
+        self.subscribers: Dict[str, Set[str]] = {}
+        self.client_topics: Dict[str, Set[str]] = {}
+
+    def subscribe(self, client_id: str, topics: Iterable[str]) -> Set[str]:
+        """
+        Add topics for a client. Returns the topics that were newly added.
+        """
+        current = self.client_topics.setdefault(client_id, set())
+        added = set()
+        for topic in topics:
+            if topic in current:
+                continue
+            current.add(topic)
+            self.subscribers.setdefault(topic, set()).add(client_id)
+            added.add(topic)
+        return added
+
+    def unsubscribe(self, client_id: str, topics: Iterable[str]) -> None:
+        current = self.client_topics.get(client_id, set())
+        for topic in topics:
+            if topic not in current:
+                continue
+            current.discard(topic)
+            subscribers = self.subscribers.get(topic)
+            if subscribers is not None:
+                subscribers.discard(client_id)
+                if not subscribers:
+                    del self.subscribers[topic]
+
+    def remove_client(self, client_id: str) -> None:
+        self.unsubscribe(client_id, list(self.client_topics.get(client_id, ())))
+        self.client_topics.pop(client_id, None)
+
+    def topics_for(self, client_id: str) -> Set[str]:
+        return self.client_topics.get(client_id, set())
+
+
+def render_topic_fragments(
+    matches: List[Dict[str, Any]],
+    topics: Iterable[str],
+    live_board: Optional[List[Dict[str, Any]]] = None
+) -> Dict[str, str]:
+    """
+    Serialize the payload of each requested topic to a JSON string, once.
+
+    The "summary" topic is the live board; pass it in if it has already been
+    built for these matches, otherwise it is summarized here.
+    A "match:<id>" topic whose match is no longer live renders as null so
+    subscribed clients learn that it went away.
+    """
+    topics = list(topics)
+    if not topics:
+        return {}
+
+    by_id = {}
+    by_tournament: Dict[str, List[Dict[str, Any]]] = {}
+    for match in matches:
+        by_id[str(match.get("match_id"))] = match
+        by_tournament.setdefault(get_tournament_name(match), []).append(match)
+
+    fragments = {}
+    for topic in topics:
+        if topic == ALL_TOPIC:
+            payload = matches
+        elif topic == SUMMARY_TOPIC:
+            payload = live_board if live_board is not None else [summarize_match(match) for match in matches]
+        elif topic.startswith(MATCH_PREFIX):
+            payload = by_id.get(topic[len(MATCH_PREFIX):])
+        elif topic.startswith(TOURNAMENT_PREFIX):
+            payload = by_tournament.get(topic[len(TOURNAMENT_PREFIX):], [])
+        else:
+            continue
+        fragments[topic] = json.dumps(payload)
+    return fragments
+
+
+def build_topic_frame(fragments: Dict[str, str], topics: Iterable[str], seq: int, epoch: str = "") -> str:
+    """
+    Assemble a client frame from pre-serialized topic fragments without
+    re-encoding the payloads. Every frame carries the data sequence number,
+    and the epoch it belongs to when one is given.
+
+    A client subscribed only to "all" gets
+    {"type": "snapshot", "seq": <seq>, "epoch": <epoch>, "matches": [...]};
+    anyone else gets
+    {"type": "update", "seq": <seq>, "epoch": <epoch>, "topics": {<topic>: <payload>, ...}}.
+    """
+    header = f'"seq":{int(seq)},"epoch":{json.dumps(epoch)}' if epoch else f'"seq":{int(seq)}'
+    topics = sorted(topic for topic in topics if topic in fragments)
+    if topics == [ALL_TOPIC]:
+        return f'{{"type":"snapshot",{header},"matches":' + fragments[ALL_TOPIC] + "}"
+
+    parts = [f"{json.dumps(topic)}:{fragments[topic]}" for topic in topics]
+    return f'{{"type":"update",{header},"topics":{{' + ",".join(parts) + "}}"
@@ -0,0 +1,215 @@
+"""
+Tracing for Tennis Bot
+
+Records every fetch cycle of the bot (and every update main_api installs) as
+a tree of timed spans: each upstream request with its status and size, each
+merge strategy, each client send. The last TRACE_CYCLES traces are kept in a
+ring buffer and served as JSON at /debug/cycles, so a slow cycle can be taken
+apart after the fact.
+
+A span is one small slotted object and two perf_counter() calls, and code
+running outside a trace gets NULL_SPAN and records nothing, so tracing stays
+on in production. The current span follows the asyncio task through a
+ContextVar: requests started with asyncio.gather() inside a span nest under it.
+
+    cycle = CYCLE_TRACES.begin("cycle", source="bot")
+    with span("merge", matches=len(data)):
+        ...
+    request = start_span("http", endpoint="events/inplay")
+    ...
+    request.finish(status=200, bytes=len(body))
+    CYCLE_TRACES.end(cycle)
+"""
+
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+TRACE_CYCLES = int(os.getenv("TENNIS_TRACE_CYCLES", "30"))  # 0 disables tracing
+# Children kept per span; further ones are only counted, so a huge cycle stays bounded
+MAX_CHILDREN = int(os.getenv("TENNIS_TRACE_MAX_CHILDREN", "500"))
+
+
+def to_ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+class Span:
+    __slots__ = ("name", "attributes", "start", "end", "children", "dropped")
+
+    def __init__(self, name: str, attributes: Dict[str, Any]):
+        self.name = name
+        self.attributes = attributes
+        self.start = time.perf_counter()
+        self.end = None
+        self.children: List["Span"] = []
+        self.dropped = 0
+
+    def child(self, name: str, attributes: Dict[str, Any]) -> "Span":
+        """Start a span under this one (it is not made current)"""
+        if len(self.children) >= MAX_CHILDREN:
+            self.dropped += 1
+            return NULL_SPAN
+        child = Span(name, attributes)
+        self.children.append(child)
+        return child
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    def finish(self, **attributes) -> None:
+        """Stop the clock (only the first call does) and add any final attributes"""
+        self.attributes.update(attributes)
+        if self.end is None:
+            self.end = time.perf_counter()
+
+    def to_dict(self, origin: float) -> Dict[str, Any]:
+        end = self.end if self.end is not None else time.perf_counter()
+        result = {
+            "name": self.name,
+            "offset_ms": to_ms(self.start - origin),
+            "duration_ms": to_ms(end - self.start),
+        }
+        if self.end is None:
+            result["in_progress"] = True
+        if self.attributes:
+            result["attributes"] = dict(self.attributes)
+        children = list(self.children)
+        if children:
+            result["children"] = [child.to_dict(origin) for child in children]
+        if self.dropped:
+            result["dropped_children"] = self.dropped
+        return result
+
+
+class NullSpan(Span):
+    """Stands in for a span outside any trace; records nothing"""
+    __slots__ = ()
+
+    def __init__(self):
+        super().__init__("", {})
+
+    def child(self, name: str, attributes: Dict[str, Any]) -> Span:
+        return self
+
+    def set(self, **attributes) -> None:
+        pass
+
+    def finish(self, **attributes) -> None:
+        pass
+
+
+NULL_SPAN = NullSpan()
+
+current_span: ContextVar[Span] = ContextVar("current_span", default=NULL_SPAN)
+
+
+def start_span(name: str, **attributes) -> Span:
+    """
+    Start a span under the current one without making it current; finish()
+    it when done. Suits leaf spans whose end is not the end of a block.
+    """
+    return current_span.get().child(name, attributes)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    Time a block as a span under the current one; spans started inside the
+    block (including in tasks it creates) become its children.
+    """
+    child = current_span.get().child(name, attributes)
+    if child is NULL_SPAN:
+        yield child
+        return
+    token = current_span.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.attributes["error"] = type(e).__name__
+        raise
+    finally:
+        current_span.reset(token)
+        child.finish()
+
+
+class TraceBuffer:
+    """
+    The last `size` traces of this process, newest last. A trace is listed
+    from the moment it begins, so spans can still be added to it (e.g. client
+    sends of the snapshot it published) after it ends.
+    """
+
+    def __init__(self, size: int = TRACE_CYCLES):
+        self.enabled = size > 0
+        self.traces = deque(maxlen=max(size, 1))  # (wall clock start, root span)
+
+    def begin(self, name: str, **attributes) -> Span:
+        """
+        Start a trace and make it the current span of this task until end().
+        For loops that cannot wrap their body in trace().
+        """
+        if not self.enabled:
+            return NULL_SPAN
+        root = Span(name, attributes)
+        self.traces.append((time.time(), root))
+        current_span.set(root)
+        return root
+
+    def end(self, root: Span, **attributes) -> None:
+        root.finish(**attributes)
+        current_span.set(NULL_SPAN)
+
+    @contextmanager
+    def trace(self, name: str, **attributes):
+        if not self.enabled:
+            yield NULL_SPAN
+            return
+        root = Span(name, attributes)
+        self.traces.append((time.time(), root))
+        token = current_span.set(root)
+        try:
+            yield root
+        except BaseException as e:
+            root.attributes["error"] = type(e).__name__
+            raise
+        finally:
+            current_span.reset(token)
+            root.finish()
+
+    def discard(self, root: Span) -> None:
+        """Drop a trace that turned out not to be worth keeping"""
+        for entry in list(self.traces):
+            if entry[1] is root:
+                try:
+                    self.traces.remove(entry)
+                except ValueError:
+                    pass
+                return
+
+    def find(self, name: str, **attributes) -> Span:
+        """The newest trace of this name whose root has all these attributes, or NULL_SPAN"""
+        for _, root in reversed(list(self.traces)):
+            if root.name == name and all(root.attributes.get(key) == value for key, value in attributes.items()):
+                return root
+        return NULL_SPAN
+
+    def to_list(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Traces as JSON-ready dicts, newest first, span offsets relative to the trace start"""
+        traces = list(self.traces)[::-1][:limit]
+        result = []
+        for started_at, root in traces:
+            trace = root.to_dict(root.start)
+            trace["started_at"] = started_at
+            result.append(trace)
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"enabled": self.enabled, "traces": len(self.traces), "capacity": self.traces.maxlen}
+
+
+# One buffer per process: in embedded mode the bot's cycles and main_api's updates share it
+CYCLE_TRACES = TraceBuffer()
@@ -0,0 +1,206 @@
+"""
+WebSocket Frame Encodings for Tennis Bot
+
+Clients pick an encoding when they connect (/ws?encoding=<name>):
+
+  - "json"     UTF-8 JSON text frames (default, what /ws has always sent)
+  - "deflate"  binary frames holding the JSON compressed with raw DEFLATE
+               (no zlib header, same as permessage-deflate, so browsers can
+               inflate them with DecompressionStream("deflate-raw"))
+  - "msgpack"  binary MessagePack frames (requires the optional msgpack package)
+
+Unlike the permessage-deflate extension, which compresses every message again
+for every connection, a FrameEncoder compresses each frame once per encoding
+and hands the same bytes to every client that asked for it. It also keeps
+bytes and CPU time per encoding so the encodings can be compared.
+"""
+
+import json
+import logging
+import os
+import time
+import zlib
+from typing import Any, Callable, Dict, Union
+
+try:
+    import msgpack
+except ImportError:  # Optional dependency, only needed for the msgpack encoding
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+JSON_ENCODING = "json"
+DEFLATE_ENCODING = "deflate"
+MSGPACK_ENCODING = "msgpack"
+
+# Tuned for frames of a few hundred KB of repetitive odds JSON: level 6 gets
+# nearly all of level 9's ratio at a fraction of the CPU
+DEFLATE_LEVEL = int(os.getenv("WS_DEFLATE_LEVEL", "6"))
+DEFLATE_WINDOW_BITS = int(os.getenv("WS_DEFLATE_WINDOW_BITS", "15"))
+DEFLATE_MEM_LEVEL = int(os.getenv("WS_DEFLATE_MEM_LEVEL", "8"))
+
+
+def available_encodings() -> list:
+    encodings = [JSON_ENCODING, DEFLATE_ENCODING]
+    if msgpack is not None:
+        encodings.append(MSGPACK_ENCODING)
+    return encodings
+
+
+def negotiate_encoding(requested: str) -> str:
+    """
+    Pick the encoding for a client, falling back to JSON if the requested
+    one is unknown or unavailable.
+    """
+    requested = (requested or JSON_ENCODING).strip().lower()
+    if requested in available_encodings():
+        return requested
+    logger.warning(f"Encoding {requested!r} not available, falling back to {JSON_ENCODING}")
+    return JSON_ENCODING
+
+
+def deflate(data: bytes) -> bytes:
+    compressor = zlib.compressobj(DEFLATE_LEVEL, zlib.DEFLATED, -DEFLATE_WINDOW_BITS, DEFLATE_MEM_LEVEL)
+    return compressor.compress(data) + compressor.flush()
+
+
+def encode_frame(text: str, encoding: str) -> Union[str, bytes]:
+    """
+    Encode a JSON text frame. Returns str for text frames and bytes for binary frames.
+    """
+    if encoding == JSON_ENCODING:
+        return text
+    if encoding == DEFLATE_ENCODING:
+        return deflate(text.encode())
+    if encoding == MSGPACK_ENCODING:
+        return msgpack.packb(json.loads(text), use_bin_type=True)
+    raise ValueError(f"Unknown encoding: {encoding}")
+
+
+class FrameEncoder:
+    """
+    Encodes frames once per encoding and keeps per-encoding statistics.
+
+    Call reset() at the start of each broadcast; encodings computed during the
+    broadcast are reused for every client that needs the same frame.
+    """
+
+    def __init__(self):
+        self.cache: Dict[tuple, Union[str, bytes]] = {}
+        self.stats: Dict[str, Dict[str, float]] = {
+            encoding: {"frames": 0, "json_bytes": 0, "encoded_bytes": 0, "encode_seconds": 0.0}
+            for encoding in (JSON_ENCODING, DEFLATE_ENCODING, MSGPACK_ENCODING)
+        }
+
+    def reset(self) -> None:
+        self.cache.clear()
+
+    def encode(self, key: Any, text: Union[str, Callable[[], str]], encoding: str) -> Union[str, bytes]:
+        """
+        Encode the frame identified by key, or return the cached encoding.
+        A key of None encodes a one-off frame without caching it. text may be
+        a function building the frame, which is then only called on a miss.
+        """
+        cache_key = (key, encoding)
+        if key is not None and cache_key in self.cache:
+            return self.cache[cache_key]
+
+        if callable(text):
+            text = text()
+        start = time.perf_counter()
+        encoded = encode_frame(text, encoding)
+        elapsed = time.perf_counter() - start
+
+        stats = self.stats[encoding]
+        stats["frames"] += 1
+        stats["json_bytes"] += len(text.encode())
+        stats["encoded_bytes"] += len(encoded.encode()) if isinstance(encoded, str) else len(encoded)
+        stats["encode_seconds"] += elapsed
+
+        if key is not None:
+            self.cache[cache_key] = encoded
+        return encoded
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Per-encoding totals plus average bytes per frame, compression ratio
+        and encode time per frame in milliseconds.
+        """
+        report = {}
+        for encoding, stats in self.stats.items():
+            frames = stats["frames"]
+            report[encoding] = {
+                **stats,
+                "available": encoding in available_encodings(),
+                "avg_bytes_per_frame": stats["encoded_bytes"] / frames if frames else 0,
+                "ratio": stats["encoded_bytes"] / stats["json_bytes"] if stats["json_bytes"] else 0,
+                "avg_encode_ms": stats["encode_seconds"] * 1000 / frames if frames else 0
+            }
+        return report
+
+
+def build_heartbeat_frame(version: int, epoch: str = "") -> str:
+    """
+    Tiny keep-alive frame telling an idle client which data version (and
+    epoch, if given) is current, sent instead of repeating the full payload.
+    """
+    frame = {"type": "heartbeat", "version": version}
+    if epoch:
+        frame["epoch"] = epoch
+    return json.dumps(frame)
+
+
+async def send_frame(websocket, frame: Union[str, bytes]) -> None:
+    """
+    Send an encoded frame as a text or binary WebSocket message.
+    """
+    if isinstance(frame, bytes):
+        await websocket.send_bytes(frame)
+    else:
+        await websocket.send_text(frame)
+
+
+# ------------------------------------------------------------------------------
+# Quick Benchmark / Example Usage
+#   python -m aggregator.sports.tennis.ws_encoding [saved /api/tennis response]
+# ------------------------------------------------------------------------------
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(level=logging.INFO)
+
+    if len(sys.argv) > 1:
+        with open(sys.argv[1]) as f:
+            data = json.load(f)
+        matches = data["matches"] if isinstance(data, dict) else data
+    else:
+        # Synthetic slate shaped like merged BetsAPI + RapidAPI records
+        matches = [{
+            "match_id": str(170000000 + i),
+            "betsapi_data": {"inplay_event": {
+                "league": {"name": f"ATP Challenger {i % 7}"},
+                "home": {"name": f"Player {i} Home"}, "away": {"name": f"Player {i} Away"},
+                "ss": "6-4,3-2", "time_status": "1"
+            }},
+            "rapid_data": {"raw_odds_data": {"markets": [
+                {"group": group, "name": f"{group} {m}", "selections": [
+                    {"name": "1", "odds": 1.5 + (i + m) % 10 / 10}, {"name": "2", "odds": 2.5}
+                ]} for group in ("Match", "Set", "Game") for m in range(10)
+            ]}}
+        } for i in range(40)]
+
+    frame = json.dumps(matches)
+    encoder = FrameEncoder()
+    for encoding in available_encodings():
+        for update in range(20):
+            encoder.reset()
+            encoder.encode(update, frame, encoding)
+
+    for encoding, stats in encoder.get_stats().items():
+        if not stats["available"]:
+            logger.info(f"{encoding:8s} unavailable (pip install msgpack)")
+            continue
+        logger.info(
+            f"{encoding:8s} {stats['avg_bytes_per_frame']:>10.0f} bytes/update  "
+            f"ratio {stats['ratio']:.3f}  encode {stats['avg_encode_ms']:.2f} ms/update"
+        )
@@ -0,0 +1,137 @@
+"""
+WebSocket Rate Limits for Tennis Bot
+
+Each /ws client belongs to a class ("list", "detail", ...) with a minimum
+interval between two updates. A client that is due an update before its
+interval has passed is not sent anything right away; instead it is flushed
+once the interval is over, with whatever is stale for it at that point. Since
+the flush always sends the current state (the latest value per match), any
+number of updates arriving within the window collapse into a single frame.
+
+Flushes are grouped into shared time buckets so that clients falling due at
+about the same time are synced together and can share rendered frames.
+
+The "relay" class is not capped at all, so it is only granted to peers that
+present the shared WS_RELAY_TOKEN (in the X-Relay-Token header); anyone else
+asking for it is served as a default client.
+"""
+
+import asyncio
+import hmac
+import logging
+import math
+import os
+from typing import Awaitable, Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Minimum seconds between two updates to one client, per client class.
+# Relays (main_api instances in relay mode) must never lag behind.
+DEFAULT_RATE_LIMITS = "default:1,list:2,detail:0.5,relay:0"
+DEFAULT_CLIENT_CLASS = "default"
+RELAY_CLIENT_CLASS = "relay"
+# Shared secret of the instances in a relay chain; unset, no client gets the relay class
+RELAY_TOKEN = os.getenv("WS_RELAY_TOKEN", "")
+
+
+def parse_rate_limits(spec: str) -> Dict[str, float]:
+    """
+    Parse "class:seconds,class:seconds" into {class: seconds}.
+    """
+    limits = {}
+    for item in spec.split(","):
+        name, _, seconds = item.partition(":")
+        try:
+            limits[name.strip()] = max(0.0, float(seconds))
+        except ValueError:
+            logger.warning(f"Ignoring invalid rate limit: {item!r}")
+    limits.setdefault(DEFAULT_CLIENT_CLASS, 1.0)
+    return limits
+
+
+RATE_LIMITS = parse_rate_limits(os.getenv("WS_RATE_LIMITS", DEFAULT_RATE_LIMITS))
+
+
+def resolve_client_class(requested: Optional[str], relay_token: Optional[str] = None) -> str:
+    """
+    The class a client is served as: the one it asked for, except that the
+    relay class needs the configured relay token.
+    """
+    if requested == RELAY_CLIENT_CLASS:
+        if RELAY_TOKEN and hmac.compare_digest((relay_token or "").encode(), RELAY_TOKEN.encode()):
+            return RELAY_CLIENT_CLASS
+        logger.warning("Client asked for the relay class without a valid relay token, serving it as default")
+        return DEFAULT_CLIENT_CLASS
+    return requested or DEFAULT_CLIENT_CLASS
+
+
+def client_min_interval(client_class: str, max_rate: Optional[str] = None) -> float:
+    """
+    Minimum interval between updates for a client. A client may ask for fewer
+    updates than its class allows (max_rate, in updates per second), never more.
+    """
+    interval = RATE_LIMITS.get(client_class, RATE_LIMITS[DEFAULT_CLIENT_CLASS])
+    try:
+        rate = float(max_rate) if max_rate else 0
+    except ValueError:
+        rate = 0
+    if rate > 0:
+        interval = max(interval, 1.0 / rate)
+    return interval
+
+
+class FlushScheduler:
+    """
+    Defers client flushes to the end of their rate limit window, grouping
+    clients whose windows end in the same time bucket into one flush call.
+    """
+
+    def __init__(self, flush: Callable[[Set[str]], Awaitable[None]], resolution: float = 0.1):
+        """
+        :param flush: Coroutine function called with the set of client IDs to flush.
+        :param resolution: Width of a time bucket in seconds.
+        """
+        self.flush = flush
+        self.resolution = resolution
+        self.buckets: Dict[float, Set[str]] = {}
+        self.pending: Dict[str, float] = {}
+        self.tasks: Set[asyncio.Task] = set()
+
+    def schedule(self, client_id: str, delay: float) -> None:
+        """
+        Flush client_id in (or just after) `delay` seconds.
+        A client that is already pending keeps its earlier slot.
+        """
+        if client_id in self.pending:
+            return
+
+        loop = asyncio.get_running_loop()
+        bucket = math.ceil((loop.time() + delay) / self.resolution) * self.resolution
+        if bucket not in self.buckets:
+            self.buckets[bucket] = set()
+            loop.call_at(bucket, self._start, bucket)
+        self.buckets[bucket].add(client_id)
+        self.pending[client_id] = bucket
+
+    def cancel(self, client_id: str) -> None:
+        bucket = self.pending.pop(client_id, None)
+        if bucket is not None and bucket in self.buckets:
+            self.buckets[bucket].discard(client_id)
+
+    def _start(self, bucket: float) -> None:
+        # The event loop only keeps a weak reference to a task, so hold on to
+        # it until the flush is done or it could be collected halfway through
+        task = asyncio.ensure_future(self._run(bucket))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def _run(self, bucket: float) -> None:
+        client_ids = self.buckets.pop(bucket, set())
+        for client_id in client_ids:
+            self.pending.pop(client_id, None)
+        if not client_ids:
+            return
+        try:
+            await self.flush(client_ids)
+        except Exception as e:
+            logger.error(f"Error flushing {len(client_ids)} rate limited clients: {e}")
@@ -1,13 +1,15 @@
 # main_api.py
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 import os
 import time
 import asyncio
 import logging
 import threading
+import multiprocessing
+import signal
 import uvicorn
 from datetime import datetime, timedelta
 import requests
@@ -15,7 +17,33 @@ import sys
 import json
 from typing import Dict, List, Any, Optional
 from aggregator.sports.tennis.market_grouper import MarketGrouper, group_markets
+from aggregator.sports.tennis.topics import (
+    ALL_TOPIC, TopicIndex, parse_topics, render_topic_fragments, build_topic_frame
+)
+from aggregator.sports.tennis.match_cache import LRUTTLCache
+from aggregator.sports.tennis.match_archive import ARCHIVE_PATH, MatchArchive
+from aggregator.sports.tennis.export import EXPORT_KINDS, export_ndjson, parse_time
+from aggregator.sports.tennis.tick_store import TickStore
+from aggregator.sports.tennis.candles import RESOLUTIONS, CandleStore
+from aggregator.sports.tennis.metrics import CONTENT_TYPE, REGISTRY, STAGE_SECONDS
+from aggregator.sports.tennis.tracing import CYCLE_TRACES, span
+from aggregator.sports.tennis.match_views import build_live_board, parse_fields, project_match
+from aggregator.sports.tennis.response_cache import ResponseCache, choose_encoding, etag_matches, make_etag
+from aggregator.sports.tennis.snapshot_stream import IPC_SOCKET_PATH, read_snapshot_stream
+from aggregator.sports.tennis.shared_snapshot import SharedSnapshotReader, SharedSnapshotWriter
+from aggregator.sports.tennis.snapshot_file import (
+    SNAPSHOT_FILE_PATH, SNAPSHOT_MAX_AGE, SNAPSHOT_SAVE_INTERVAL, atomic_write, load_json_file
+)
+from aggregator.sports.tennis.relay import RESYNC, UPDATED, RelayState
+from aggregator.sports.tennis.delta_buffer import DeltaRingBuffer, compute_delta, hash_matches
+from aggregator.sports.tennis.ws_encoding import (
+    JSON_ENCODING, FrameEncoder, available_encodings, build_heartbeat_frame, negotiate_encoding, send_frame
+)
+from aggregator.sports.tennis.ws_rate_limit import (
+    RATE_LIMITS, RELAY_TOKEN, FlushScheduler, client_min_interval, resolve_client_class
+)
 import hashlib
+import secrets
 import pytz
 
 # Configure logging
@@ -37,19 +65,92 @@ logger.addHandler(ch)
 
 # Tennis Bot API endpoint
 TENNIS_BOT_API = os.environ.get("TENNIS_BOT_API", "http://localhost:8000/api/tennis")
+# "ipc" receives snapshots pushed by the bot over its Unix socket (polling
+# TENNIS_BOT_API only while that is unavailable); "poll" always polls;
+# "embedded" runs TennisBot inside this process and takes its snapshots in memory;
+# "shared" is set for the workers of a multi-worker deployment (see API_WORKERS);
+# "relay" follows another main_api instance's /ws stream at UPSTREAM_WS_URL
+TENNIS_BOT_FEED = os.environ.get("TENNIS_BOT_FEED", "ipc")
+UPSTREAM_WS_URL = os.environ.get("UPSTREAM_WS_URL", "ws://localhost:8080/ws")
+RELAY_RECONNECT_INTERVAL = 2  # Seconds between attempts to reach the upstream instance
+EMBEDDED_BOT_RESTART_DELAY = 10  # Seconds before an embedded TennisBot that stopped is started again
+MAIN_API_PORT = int(os.environ.get("MAIN_API_PORT", "8080"))
+POLL_INTERVAL = 10  # Seconds between polls of TENNIS_BOT_API
+# With more than one worker, an ingest process runs the feed above and shares
+# every snapshot with API_WORKERS uvicorn workers through shared memory
+API_WORKERS = int(os.environ.get("API_WORKERS", "1"))
+SHARED_SNAPSHOT_POLL_INTERVAL = float(os.environ.get("SHARED_SNAPSHOT_POLL_INTERVAL", "0.25"))
+# The permessage-deflate extension compresses every shared frame again for every
+# connection (and uvicorn cannot turn it off per format), so it is off by default;
+# clients that want compression use ?encoding=deflate, compressed once for everyone
+WS_PER_MESSAGE_DEFLATE = os.environ.get("WS_PER_MESSAGE_DEFLATE", "0") == "1"
+# Liveness: protocol-level ping/pong from uvicorn, plus a tiny heartbeat frame
+# carrying the data version for clients that have been idle this long
+WS_PING_INTERVAL = float(os.environ.get("WS_PING_INTERVAL", "20"))
+WS_PING_TIMEOUT = float(os.environ.get("WS_PING_TIMEOUT", "20"))
+WS_HEARTBEAT_INTERVAL = float(os.environ.get("WS_HEARTBEAT_INTERVAL", "15"))
+# How many recent deltas are kept for clients resuming after a reconnect
+WS_DELTA_BUFFER_SIZE = int(os.environ.get("WS_DELTA_BUFFER_SIZE", "50"))
+# Longest time a /api/tennis?since=...&wait=... long-poll request is held open
+LONG_POLL_MAX_WAIT = float(os.environ.get("LONG_POLL_MAX_WAIT", "60"))
+SSE_RETRY_MS = 3000  # How long EventSource clients wait before reconnecting
+# Feeds whose versions this process owns save the latest snapshot to
+# SNAPSHOT_FILE_PATH and serve it straight away after a restart
+WARM_START_FEEDS = ("ipc", "poll", "embedded")
 
 # Global variables
 tennis_matches = []
-# Add a cache to store historical match data with a TTL
-match_cache = {}
+match_index = {}  # match_id -> live match, rebuilt and swapped in whole on every update
+live_board = []  # Compact summary row per live match, rebuilt on every update
+market_groups = {}  # match_id -> grouped markets of the current version, built on first request
 CACHE_TTL = 3600  # Cache matches for 1 hour (in seconds)
+CACHE_MAX_ENTRIES = int(os.environ.get("MATCH_CACHE_MAX_ENTRIES", "2000"))
+CACHE_SWEEP_INTERVAL = 60  # Seconds between sweeps of expired history entries
+# Bounded LRU + TTL cache of matches that are no longer live
+match_cache = LRUTTLCache(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL)
+# Every version of every match, on disk (MATCH_ARCHIVE_PATH="" disables it)
+match_archive = MatchArchive(ARCHIVE_PATH) if ARCHIVE_PATH else None
+tick_store = TickStore()  # Price history per (match, market, selection) of live matches
+candle_store = CandleStore()  # OHLC candles of every tick series, extended as ticks arrive
+tick_store.tick_listeners.append(candle_store.on_tick)
 last_processed_data_hash = ""  # Track when data actually changes in the process loop
+data_version = 0  # Incremented every time the match data actually changes
+# Version numbers start over in every process, so each version also carries the
+# epoch it was made in: this process's, or that of the saved snapshot, ingest
+# process or upstream it came from. ETags include it
+PROCESS_EPOCH = secrets.token_hex(4)
+data_epoch = PROCESS_EPOCH
+data_timestamp = None  # Eastern time ISO timestamp of when the current version was installed
+response_cache = ResponseCache()  # REST bodies rendered and compressed once per data version
+version_event = asyncio.Event()  # Set and replaced on every version change, wakes long-poll requests
+shared_writer = None  # Publishes every version to the workers, in the ingest process only
+saved_version = None  # (epoch, version) last saved to SNAPSHOT_FILE_PATH
+data_installed_at = time.time()  # When the current version was installed, for the snapshot age metric
+feed_error = None  # Why the data feed stopped, while it is down; /api/health is 503 until it recovers
+match_hashes = {}  # Per-match hashes of the current data, used to compute deltas
+delta_buffer = DeltaRingBuffer(WS_DELTA_BUFFER_SIZE)  # Recent (seq, delta) pairs for resuming clients
 websocket_clients = {}  # Store client-specific data
 active_connections = []  # Active WebSocket connections
+topic_index = TopicIndex()  # Per-topic subscriber index for /ws clients
+frame_encoder = FrameEncoder()  # Encodes each broadcast frame once per encoding
+sse_clients = 0  # Connected /api/tennis/stream clients
+# Defers updates for clients inside their rate limit window, see sync_clients
+flush_scheduler = FlushScheduler(lambda client_ids: flush_rate_limited_clients(client_ids))
 
 # Market grouper instance
 market_grouper = MarketGrouper()
 
+# Metrics served at /metrics; the gauges are read at scrape time
+UPDATES = REGISTRY.counter("main_api_updates_total", "Updates received from the feed", ("result",))
+REGISTRY.gauge("main_api_live_matches", "Matches in the current version").set_function(lambda: len(tennis_matches))
+REGISTRY.gauge("main_api_data_version", "Current data version").set_function(lambda: data_version)
+REGISTRY.gauge("main_api_snapshot_age_seconds", "Seconds since the current version was installed").set_function(
+    lambda: time.time() - data_installed_at
+)
+CLIENTS = REGISTRY.gauge("main_api_clients", "Connected streaming clients", ("transport",))
+CLIENTS.set_function(lambda: len(websocket_clients), "ws")
+CLIENTS.set_function(lambda: sse_clients, "sse")
+
 app = FastAPI()
 
 # Set up CORS
@@ -66,26 +167,134 @@ async def startup_event():
     """
     Run tasks when the FastAPI app starts.
     """
-    global tennis_matches
-    
     # Set up initial data
+    fetch_first = False
     try:
-        logger.info("Fetching initial tennis data on startup...")
-        tennis_matches = await setup_tennis_data()
+        # A saved snapshot is served right away and the feed replaces it in the
+        # background. An embedded bot has no HTTP API yet, and workers read the
+        # ingest process's snapshot; either way the data arrives through the feed
+        fetch_first = not load_saved_snapshot() and TENNIS_BOT_FEED not in ("embedded", "shared", "relay")
+        if fetch_first:
+            # Served at version 0 (not ready) while the first fetch runs
+            install_debug_data()
+        index_current_data()
     except Exception as e:
         logger.error(f"Error setting up initial tennis data: {e}")
     
-    # Start the background task to process tennis data
-    asyncio.create_task(process_tennis_data())
+    # Workers are started by uvicorn from an import, which skips the __main__ block
+    if TENNIS_BOT_FEED == "shared":
+        mount_react_build()
+    
+    # Start the background task to process tennis data. Without a saved
+    # snapshot it fetches the bot's data first, so a bot that is down cannot
+    # hold up startup; /api/health reports 503 until real data is published
+    async def run_feed():
+        if fetch_first:
+            await fetch_initial_data()
+        await process_tennis_data()
+    
+    asyncio.create_task(run_feed())
     logger.info("Background task for processing tennis data started")
+    
+    # Start the background task that sweeps expired matches from the history cache
+    asyncio.create_task(sweep_match_cache())
+    
+    asyncio.create_task(send_heartbeats_periodically())
+    
+    if SNAPSHOT_FILE_PATH and TENNIS_BOT_FEED in WARM_START_FEEDS:
+        asyncio.create_task(save_snapshot_periodically())
+
+@app.on_event("shutdown")
+def shutdown_event():
+    """Save the latest snapshot so the next start can serve it immediately"""
+    if SNAPSHOT_FILE_PATH and TENNIS_BOT_FEED in WARM_START_FEEDS:
+        try:
+            save_snapshot(data_version, data_timestamp, tennis_matches, data_epoch)
+        except Exception as e:
+            logger.error(f"Error saving snapshot on shutdown: {e}")
+
+def load_saved_snapshot() -> bool:
+    """
+    Install the snapshot saved by the previous run, if there is a recent one.
+    Versions carry on from it, so clients' ETags and since values stay valid.
+    """
+    global tennis_matches, data_version, data_timestamp, data_epoch, saved_version
+    if not SNAPSHOT_FILE_PATH or TENNIS_BOT_FEED not in WARM_START_FEEDS:
+        return False
+    data = load_json_file(SNAPSHOT_FILE_PATH, SNAPSHOT_MAX_AGE)
+    if not data or not isinstance(data.get("matches"), list):
+        return False
+    tennis_matches = data["matches"]
+    data_version = int(data.get("version") or 0)
+    # The snapshot keeps the epoch it was made in; versions published from
+    # here on get this process's epoch, so reused numbers never collide
+    data_epoch = data.get("epoch") or PROCESS_EPOCH
+    data_timestamp = data.get("timestamp")
+    saved_version = (data_epoch, data_version)
+    logger.info(f"Warm start: serving {len(tennis_matches)} matches from {SNAPSHOT_FILE_PATH} (version {data_version})")
+    return True
+
+def save_snapshot(version, timestamp, matches, epoch):
+    """Write a version to SNAPSHOT_FILE_PATH unless it is already there"""
+    global saved_version
+    # Version 0 is whatever startup came up with (possibly debug data), never real data
+    if (epoch, version) == saved_version or not version:
+        return
+    body = json.dumps({"timestamp": timestamp, "version": version, "epoch": epoch, "matches": matches}).encode()
+    atomic_write(SNAPSHOT_FILE_PATH, body)
+    saved_version = (epoch, version)
+
+async def save_snapshot_periodically():
+    """Save the latest snapshot every SNAPSHOT_SAVE_INTERVAL seconds, off the event loop"""
+    while True:
+        await asyncio.sleep(SNAPSHOT_SAVE_INTERVAL)
+        try:
+            # The match list is replaced on every update, never modified, so
+            # the thread can serialize it while new versions are installed
+            await asyncio.to_thread(save_snapshot, data_version, data_timestamp, tennis_matches, data_epoch)
+        except Exception as e:
+            logger.error(f"Error saving snapshot: {e}")
+
+def build_match_index(matches):
+    """Map match_id -> match for O(1) lookups"""
+    return {str(match.get("match_id")): match for match in matches if match.get("match_id")}
+
+async def sweep_match_cache():
+    """Periodically drop expired entries from the match history cache"""
+    while True:
+        await asyncio.sleep(CACHE_SWEEP_INTERVAL)
+        try:
+            match_cache.sweep()
+        except Exception as e:
+            logger.error(f"Error sweeping match cache: {e}")
+
+def index_current_data():
+    """Build the indexes and hashes of data installed without publishing it (saved or debug data)"""
+    global match_index, live_board, match_hashes, last_processed_data_hash, data_timestamp
+    data_timestamp = data_timestamp or datetime.now(eastern_tz).isoformat()
+    match_index = build_match_index(tennis_matches)
+    live_board = build_live_board(tennis_matches)
+    match_hashes, last_processed_data_hash = hash_matches(tennis_matches)
+
+async def fetch_initial_data():
+    """Fetch and publish the bot's current data before following the feed"""
+    logger.info("Fetching initial tennis data on startup...")
+    try:
+        fetched = await setup_tennis_data()
+        if fetched is not None:
+            # Real data gets a real version, so /api/health reports ready
+            # even if the feed keeps delivering the same data
+            await publish_tennis_data(fetched)
+    except Exception as e:
+        logger.error(f"Error setting up initial tennis data: {e}")
 
 async def setup_tennis_data():
     """
     Initial setup to populate tennis_matches when the server starts.
-    Tries to fetch data from tennis_bot and sets up debug data as fallback.
+    Returns the matches fetched from tennis_bot, to be published as the first
+    version. Failing that, installs debug data at version 0 (which does not
+    count as ready) unless there is some already, and returns None.
     """
-    global tennis_matches
-    
     # Try to access the Tennis Bot API
     logger.info(f"Trying to fetch initial data from Tennis Bot API at: {TENNIS_BOT_API}")
     
@@ -96,81 +305,409 @@ async def setup_tennis_data():
         "http://127.0.0.1:8000/api/tennis"
     ]
     
-    success = False
-    
     for url in urls_to_try:
         try:
             logger.info(f"Attempting to fetch initial data from: {url}")
-            response = requests.get(url, timeout=10)
+            response = await asyncio.to_thread(requests.get, url, timeout=10)
             response.raise_for_status()
             data = response.json()
             
             if data and isinstance(data, dict) and "matches" in data and len(data["matches"]) > 0:
                 logger.info(f"Successfully fetched {len(data['matches'])} matches from {url}")
-                tennis_matches = data["matches"]
-                success = True
-                break
+                return data["matches"]
         except Exception as e:
             logger.warning(f"Failed to fetch from {url}: {str(e)}")
     
     # If we couldn't get data from any source, use debug data
-    if not success or not tennis_matches:
-        logger.warning("Couldn't fetch real tennis data, using debug data")
-        tennis_matches = [{
-            "match_id": "debug_match_1",
-            "betsapi_data": {
-                "inplayEvent": {
-                    "league": {"name": "Debug Tennis League", "cc": "US"},
-                    "time": str(int(time.time())),
-                    "time_status": "1", 
-                    "home": {"name": "Debug Player 1", "cc": "US"},
-                    "away": {"name": "Debug Player 2", "cc": "GB"},
-                    "ss": "2-1",
-                    "scores": {
-                        "1": {"home": 6, "away": 4},
-                        "2": {"home": 4, "away": 6},
-                        "3": {"home": 2, "away": 1}
-                    }
+    logger.warning("Couldn't fetch real tennis data, using debug data")
+    if not tennis_matches:
+        install_debug_data()
+    return None
+
+def install_debug_data():
+    """Placeholder data served at version 0 until the first real data arrives"""
+    global tennis_matches
+    tennis_matches = [{
+        "match_id": "debug_match_1",
+        "betsapi_data": {
+            "inplayEvent": {
+                "league": {"name": "Debug Tennis League", "cc": "US"},
+                "time": str(int(time.time())),
+                "time_status": "1", 
+                "home": {"name": "Debug Player 1", "cc": "US"},
+                "away": {"name": "Debug Player 2", "cc": "GB"},
+                "ss": "2-1",
+                "scores": {
+                    "1": {"home": 6, "away": 4},
+                    "2": {"home": 4, "away": 6},
+                    "3": {"home": 2, "away": 1}
                 }
-            },
-            "rapid_data": {
-                "grouped_markets": []
             }
-        }]
+        },
+        "rapid_data": {
+            "grouped_markets": []
+        }
+    }]
+    
+    logger.info(f"Initial tennis data set with {len(tennis_matches)} debug matches")
+
+def not_modified_response() -> Response:
+    # no-cache makes browsers revalidate with If-None-Match on every fetch
+    return Response(status_code=304, headers={
+        "ETag": make_etag(data_version, epoch=data_epoch),
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding"
+    })
+
+def cached_json_response(request: Request, key: str, render) -> Response:
+    """
+    Serve a JSON body rendered once per data version, compressed with the
+    best encoding the client accepts. A client that already has this
+    version (If-None-Match) gets a 304 and nothing is rendered.
+    """
+    if etag_matches(request.headers.get("if-none-match", ""), data_version, data_epoch):
+        return not_modified_response()
     
-    logger.info(f"Initial tennis data set with {len(tennis_matches)} matches")
-    return tennis_matches
+    variants = response_cache.get((data_epoch, data_version), key, render)
+    encoding = choose_encoding(request.headers.get("accept-encoding", ""), variants)
+    headers = {
+        "ETag": make_etag(data_version, encoding, data_epoch),
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding"
+    }
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=variants[encoding], media_type="application/json", headers=headers)
 
+# The REST endpoints are async so they run on the event loop and always see
+# tennis_matches, match_index and data_version from the same update
 @app.get("/api/tennis/match/{match_id}")
-def get_match_details(match_id: str):
+async def get_match_details(match_id: str, request: Request):
     logger.info(f"Match details requested for match_id: {match_id}")
     
     # First check current matches
-    for match in tennis_matches:
-        if match.get("match_id") == match_id:
-            return match
-    
-    # If not found in current matches, check the cache
-    if match_id in match_cache:
-        cache_entry = match_cache[match_id]
-        # Check if cache entry is still valid
-        if time.time() - cache_entry["timestamp"] < CACHE_TTL:
-            logger.info(f"Match {match_id} found in cache")
-            return cache_entry["data"]
+    match = match_index.get(match_id)
+    if match is not None:
+        return cached_json_response(request, f"match:{match_id}", lambda: match)
+    
+    # If not found in current matches, check the history cache
+    match = match_cache.get(match_id)
+    if match is not None:
+        logger.info(f"Match {match_id} found in cache")
+        return cached_json_response(request, f"history:{match_id}", lambda: match)
+    
+    # Finally, the last archived version of the match
+    if match_archive is not None:
+        state = await asyncio.to_thread(match_archive.state_at, match_id, time.time())
+        if state is not None:
+            logger.info(f"Match {match_id} found in archive")
+            return cached_json_response(request, f"history:{match_id}", lambda: state["match"])
     
     # If we get here, the match is not found
     raise HTTPException(status_code=404, detail="Match not found")
 
+@app.get("/api/tennis/match/{match_id}/odds")
+async def get_match_odds_series(match_id: str):
+    """The price series recorded for a match, with their tick counts and last prices"""
+    series = tick_store.describe_match(match_id)
+    if not series:
+        raise HTTPException(status_code=404, detail="No odds recorded for this match")
+    return {"match_id": match_id, "series": series}
+
+@app.get("/api/tennis/match/{match_id}/odds/{selection}/candles")
+async def get_match_odds_candles(match_id: str, selection: str, request: Request,
+                                 res: str = "1m", market: Optional[str] = None):
+    """OHLC candles of one selection's price at 10s, 1m or 5m resolution"""
+    if res not in RESOLUTIONS:
+        raise HTTPException(status_code=400, detail=f"res must be one of {', '.join(RESOLUTIONS)}")
+    found = tick_store.find_series(match_id, selection, market)
+    if not found:
+        raise HTTPException(status_code=404, detail="No odds recorded for this selection")
+    if len(found) > 1:
+        markets = ", ".join(sorted(series_market for series_market, _ in found))
+        raise HTTPException(status_code=400, detail=f"Selection is in several markets, pass market= one of: {markets}")
+    market = found[0][0]
+    candles = candle_store.get(match_id, market, selection, res)
+    if candles is None:
+        raise HTTPException(status_code=404, detail="No odds recorded for this selection")
+    # Candles only change when a new version brings ticks, so each is rendered once per version
+    return cached_json_response(request, f"candles:{match_id}:{market}:{selection}:{res}", lambda: {
+        "match_id": match_id,
+        "market": market,
+        "selection": selection,
+        "res": res,
+        "candles": candles.to_list()
+    })
+
+@app.get("/api/tennis/match/{match_id}/history")
+def get_match_history(match_id: str, start: float = 0, end: Optional[float] = None, limit: int = 1000):
+    """Timestamps (Unix seconds) and versions archived for a match"""
+    if match_archive is None:
+        raise HTTPException(status_code=404, detail="Match archive is disabled")
+    return {"match_id": match_id, "versions": match_archive.versions(match_id, start, end, min(limit, 10000))}
+
+@app.get("/api/tennis/match/{match_id}/history/{ts}")
+def get_match_state_at(match_id: str, ts: float):
+    """The archived state of a match as of a Unix timestamp"""
+    if match_archive is None:
+        raise HTTPException(status_code=404, detail="Match archive is disabled")
+    state = match_archive.state_at(match_id, ts)
+    if state is None:
+        raise HTTPException(status_code=404, detail="No archived state for this match at that time")
+    return state
+
+@app.get("/api/tennis/export")
+def export_archive(kind: str = "versions", start: Optional[str] = None, end: Optional[str] = None,
+                   tournament: Optional[str] = None, gzip: bool = False):
+    """
+    Stream archived match versions or odds ticks as NDJSON (optionally gzip),
+    filtered by time range (Unix seconds or ISO dates) and tournament name
+    """
+    if match_archive is None:
+        raise HTTPException(status_code=404, detail="Match archive is disabled")
+    if kind not in EXPORT_KINDS:
+        raise HTTPException(status_code=400, detail=f"kind must be one of {', '.join(EXPORT_KINDS)}")
+    try:
+        start_ts, end_ts = parse_time(start) or 0, parse_time(end)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="start and end must be Unix seconds or ISO dates")
+    # A sync generator is advanced chunk by chunk in the threadpool, only as fast as the client reads
+    chunks = export_ndjson(match_archive, kind, start_ts, end_ts, tournament, gzip)
+    filename = f"tennis_{kind}.ndjson" + (".gz" if gzip else "")
+    return StreamingResponse(
+        chunks,
+        media_type="application/gzip" if gzip else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@app.get("/api/tennis/match/{match_id}/markets")
+async def get_match_market_groups(match_id: str, request: Request):
+    """Names and sizes of a live match's market groups"""
+    match = match_index.get(match_id)
+    if match is None:
+        raise HTTPException(status_code=404, detail="Match not found")
+    return cached_json_response(request, f"market_groups:{match_id}", lambda: {
+        "match_id": match_id,
+        "groups": {name: len(markets) for name, markets in get_market_groups(match_id, match).items()}
+    })
+
+@app.get("/api/tennis/match/{match_id}/markets/{group}")
+async def get_match_market_group(match_id: str, group: str, request: Request):
+    """The markets of a single group of a live match, e.g. Set Winner"""
+    match = match_index.get(match_id)
+    if match is None:
+        raise HTTPException(status_code=404, detail="Match not found")
+    
+    groups = get_market_groups(match_id, match)
+    name = group if group in groups else next((n for n in groups if n.lower() == group.lower()), None)
+    if name is None:
+        raise HTTPException(status_code=404, detail="Market group not found")
+    return cached_json_response(request, f"markets:{match_id}:{name}", lambda: {
+        "match_id": match_id,
+        "group": name,
+        "markets": groups[name]
+    })
+
+def get_market_groups(match_id, match):
+    """Group a match's RapidAPI markets by their 'group' field, on demand and once per version"""
+    groups = market_groups.get(match_id)
+    if groups is None:
+        groups = market_grouper.process_matches([match])[0].get("grouped_markets", {})
+        market_groups[match_id] = groups
+    return groups
+
+async def is_up_to_date(since: Optional[int], wait: float, epoch: Optional[str] = None) -> bool:
+    """
+    Whether a client that has data version `since` has nothing newer to get.
+    With wait > 0 this long-polls: it holds on until a newer version arrives
+    or the wait runs out. Clients passing the epoch from the response body
+    are also told about a version from another run with the same number.
+    """
+    # A since ahead of our version means we restarted, so answer right away
+    if since is None or since != data_version or (epoch is not None and epoch != data_epoch):
+        return False
+    if wait > 0:
+        try:
+            await asyncio.wait_for(version_event.wait(), timeout=min(wait, LONG_POLL_MAX_WAIT))
+        except asyncio.TimeoutError:
+            pass
+    return since == data_version and (epoch is None or epoch == data_epoch)
+
+@app.get("/api/tennis/summary")
+async def get_live_board(request: Request, since: Optional[int] = None, wait: float = 0,
+                         epoch: Optional[str] = None):
+    """
+    The live board: one compact row per match (players, score, status and
+    headline prices), built once per update. Supports since/wait like /api/tennis.
+    """
+    if await is_up_to_date(since, wait, epoch):
+        return not_modified_response()
+    return cached_json_response(request, "summary", lambda: {
+        "timestamp": data_timestamp,
+        "version": data_version,
+        "epoch": data_epoch,
+        "matches": live_board
+    })
+
 @app.get("/api/tennis")
-def get_tennis_matches():
+async def get_tennis_matches(request: Request, since: Optional[int] = None, wait: float = 0,
+                             epoch: Optional[str] = None, fields: Optional[str] = None):
+    """
+    All current matches. With ?since=<version>, a client that already has the
+    current version gets a 304; adding &wait=<seconds> long-polls, holding the
+    request until a newer version arrives or the wait runs out (then 304).
+    ?fields=match_id,betsapi_data.inplay_event.ss returns only those fields
+    of each match.
+    """
+    if await is_up_to_date(since, wait, epoch):
+        return not_modified_response()
+    
     logger.info(f"API request received. Current data length: {len(tennis_matches)}")
-    # Use Eastern Time (UTC-4)
-    eastern_time = datetime.now(pytz.timezone('US/Eastern'))
+    field_list = parse_fields(fields)
+    if field_list:
+        return cached_json_response(request, "list:" + ",".join(field_list), lambda: {
+            "timestamp": data_timestamp,
+            "version": data_version,
+            "epoch": data_epoch,
+            "matches": [project_match(match, field_list) for match in tennis_matches]
+        })
+    
+    return cached_json_response(request, "list", list_payload)
+
+@app.get("/api/tennis/stream")
+async def stream_tennis_events(
+    request: Request, since: Optional[int] = None, epoch: Optional[str] = None, deltas: int = 1
+):
+    """
+    Server-Sent Events alternative to /ws for one-way consumers: the same
+    snapshot, delta and heartbeat frames, each event's ID being
+    "<epoch>:<seq>". A reconnecting EventSource sends Last-Event-ID and only
+    gets what it missed; ?since=<seq>&epoch=<epoch> does the same for other
+    clients. ?deltas=0 sends a full snapshot on every update instead.
+    """
+    last_event_id = request.headers.get("last-event-id")
+    if last_event_id:
+        epoch, _, last_seq = last_event_id.rpartition(":")
+        since = parse_seq(last_seq)
+    return StreamingResponse(
+        sse_events(since, epoch, bool(deltas)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def sse_message(frame: str, seq: Optional[int] = None, epoch: str = "") -> str:
+    """One Server-Sent Events message; epoch and seq become the event ID to resume from"""
+    event_id = f"id: {epoch}:{seq}\n" if seq is not None else ""
+    return f"{event_id}data: {frame}\n\n"
+
+async def sse_events(since: Optional[int], since_epoch: Optional[str], deltas: bool):
+    """
+    Stream events to one SSE client. Frames use the same keys as the /ws
+    broadcast, so each is built and encoded once per version for both.
+    """
+    global sse_clients
+    sse_clients += 1
+    # The version this client has, if known, and the epoch it belongs to
+    seq, epoch = since, since_epoch
+    try:
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        while True:
+            event = version_event
+            if (seq, epoch) != (data_version, data_epoch):
+                if seq is None or not deltas:
+                    frame = frame_encoder.encode(
+                        (data_version, (ALL_TOPIC,)),
+                        lambda: build_topic_frame(
+                            render_topic_fragments(tennis_matches, [ALL_TOPIC]), [ALL_TOPIC], data_version, data_epoch
+                        ),
+                        JSON_ENCODING
+                    )
+                else:
+                    frame = frame_encoder.encode(
+                        (data_version, "delta", epoch, seq), lambda: build_resume_frame(seq, epoch), JSON_ENCODING
+                    )
+                send_span = CYCLE_TRACES.find("update", source="main_api", version=data_version).child(
+                    "sse_send", {"bytes": len(frame)}
+                )
+                yield sse_message(frame, data_version, data_epoch)
+                # Resumed once the message has been written to the client
+                send_span.finish()
+                seq, epoch = data_version, data_epoch
+                continue
+            
+            try:
+                await asyncio.wait_for(event.wait(), timeout=WS_HEARTBEAT_INTERVAL)
+            except asyncio.TimeoutError:
+                yield sse_message(frame_encoder.encode(
+                    ("heartbeat", data_version), build_heartbeat_frame(data_version, data_epoch), JSON_ENCODING
+                ))
+    finally:
+        sse_clients -= 1
+
+def list_payload():
+    # The timestamp is when this version of the data arrived (Eastern Time),
+    # so the body is the same for every request until the next update
     return {
-        "timestamp": eastern_time.isoformat(),
+        "timestamp": data_timestamp,
+        "version": data_version,
+        "epoch": data_epoch,
         "matches": tennis_matches
     }
 
+@app.get("/api/health")
+async def get_health():
+    """
+    Readiness probe: 200 once real data (a saved or published version) is
+    loaded, 503 until then and while the data feed is down
+    """
+    ready = bool(data_version) and feed_error is None
+    content = {"ready": ready, "version": data_version, "matches": len(tennis_matches)}
+    if feed_error is not None:
+        content["feed_error"] = feed_error
+    return JSONResponse(status_code=200 if ready else 503, content=content)
+
+@app.get("/api/cache/stats")
+async def get_cache_stats():
+    """Live match index size and match history cache counters"""
+    return {
+        "live_matches": len(match_index),
+        "history": match_cache.get_stats(),
+        "responses": response_cache.get_stats(),
+        "archive": match_archive.get_stats() if match_archive is not None else None,
+        "ticks": tick_store.get_stats(),
+        "candles": candle_store.get_stats()
+    }
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus text exposition of per-stage latencies, counters and gauges"""
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
+
+@app.get("/debug/cycles")
+async def get_debug_cycles(limit: Optional[int] = None):
+    """Span trees of the most recent updates (and bot cycles when embedded), newest first"""
+    return {"tracing": CYCLE_TRACES.get_stats(), "cycles": CYCLE_TRACES.to_list(limit)}
+
+@app.get("/api/ws/stats")
+async def get_websocket_stats():
+    """Bytes per update and encode CPU for each WebSocket encoding"""
+    encodings = {}
+    for client_info in websocket_clients.values():
+        encodings[client_info["encoding"]] = encodings.get(client_info["encoding"], 0) + 1
+    classes = {}
+    for client_info in websocket_clients.values():
+        classes[client_info["client_class"]] = classes.get(client_info["client_class"], 0) + 1
+    return {
+        "clients": len(websocket_clients),
+        "clients_per_encoding": encodings,
+        "clients_per_class": classes,
+        "rate_limits": RATE_LIMITS,
+        "rate_limited_clients": len(flush_scheduler.pending),
+        "sse_clients": sse_clients,
+        "available_encodings": available_encodings(),
+        "encodings": frame_encoder.get_stats()
+    }
+
 @app.get("/")
 @app.get("/{full_path:path}")
 def serve_react_app(full_path: str = ""):
@@ -187,6 +724,109 @@ def serve_react_app(full_path: str = ""):
         logger.error(f"Index file not found at: {index_path}")
         return {"message": "Frontend not available. Please build the React app."}
 
+def is_delta_client(client_id: str) -> bool:
+    """Delta clients follow the full match list through sequenced deltas"""
+    client_info = websocket_clients.get(client_id)
+    return bool(client_info and client_info["deltas"] and topic_index.topics_for(client_id) == {ALL_TOPIC})
+
+def build_resume_frame(
+    since_seq: Optional[int], since_epoch: Optional[str], fragments: Optional[Dict[str, str]] = None
+) -> str:
+    """
+    Frame bringing a delta client from since_seq to the current version: the
+    merged missed deltas if the ring buffer still covers since_seq, otherwise
+    a full snapshot. A seq from another epoch (an earlier run, or a client
+    that did not say) always gets the snapshot, as its numbers do not refer
+    to our versions.
+    """
+    delta = delta_buffer.since(since_seq, since_epoch) if since_seq is not None else None
+    if delta is not None and delta["seq"] == data_version and since_epoch == data_epoch:
+        return json.dumps({"type": "delta", "epoch": data_epoch, **delta})
+
+    if not fragments or ALL_TOPIC not in fragments:
+        fragments = render_topic_fragments(tennis_matches, [ALL_TOPIC])
+    return build_topic_frame(fragments, [ALL_TOPIC], data_version, data_epoch)
+
+async def send_topics(client_id: str, topics) -> None:
+    """Render the given topics from the current data and send them to one client"""
+    client_info = websocket_clients.get(client_id)
+    if not client_info or not tennis_matches:
+        return
+
+    fragments = render_topic_fragments(tennis_matches, topics, live_board)
+    if not fragments:
+        return
+
+    text = build_topic_frame(fragments, fragments.keys(), data_version, data_epoch)
+    await send_frame(client_info["connection"], frame_encoder.encode(None, text, client_info["encoding"]))
+    for topic, fragment in fragments.items():
+        client_info["last_sent_hashes"][topic] = hashlib.md5(fragment.encode()).hexdigest()
+    client_info["seq"], client_info["epoch"] = data_version, data_epoch
+    client_info["last_sent_time"] = client_info["last_update_time"] = time.time()
+
+async def send_resume(client_id: str, since_seq: Optional[int], since_epoch: Optional[str]) -> None:
+    """Bring a delta client up to date from the last sequence number (and epoch) it saw"""
+    client_info = websocket_clients.get(client_id)
+    if not client_info or not tennis_matches:
+        return
+
+    text = build_resume_frame(since_seq, since_epoch)
+    await send_frame(client_info["connection"], frame_encoder.encode(None, text, client_info["encoding"]))
+    client_info["seq"], client_info["epoch"] = data_version, data_epoch
+    client_info["last_sent_time"] = client_info["last_update_time"] = time.time()
+    logger.info(f"Resumed client {client_id} from seq {since_epoch}:{since_seq} to {data_epoch}:{data_version}")
+
+def parse_seq(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+async def handle_client_message(client_id: str, msg: str) -> None:
+    """
+    Handle a control message from a /ws client.
+
+    Supported messages (JSON):
+      {"action": "subscribe", "topics": ["match:<id>", "tournament:<name>", "summary", "all"]}
+      {"action": "unsubscribe", "topics": [...]}
+      {"action": "resume", "seq": <last seq seen>, "epoch": <its epoch>}
+    Anything else (e.g. the frontend's plain "ping") is ignored.
+    """
+    try:
+        message = json.loads(msg)
+    except ValueError:
+        return
+    if not isinstance(message, dict):
+        return
+
+    client_info = websocket_clients.get(client_id)
+    if not client_info:
+        return
+
+    action = message.get("action")
+    topics = parse_topics(message.get("topics", []))
+
+    if action == "subscribe" and topics:
+        # The first explicit subscription replaces the implicit "all" default
+        if client_info.get("implicit_all") and ALL_TOPIC not in topics:
+            topic_index.unsubscribe(client_id, [ALL_TOPIC])
+            client_info["last_sent_hashes"].pop(ALL_TOPIC, None)
+        client_info["implicit_all"] = False
+        added = topic_index.subscribe(client_id, topics)
+        logger.info(f"Client {client_id} subscribed to {sorted(added)}")
+        await send_topics(client_id, added)
+    elif action == "unsubscribe" and topics:
+        topic_index.unsubscribe(client_id, topics)
+        for topic in topics:
+            client_info["last_sent_hashes"].pop(topic, None)
+        logger.info(f"Client {client_id} unsubscribed from {topics}")
+    elif action == "resume":
+        client_info["deltas"] = True
+        if is_delta_client(client_id):
+            await send_resume(client_id, parse_seq(message.get("seq")), message.get("epoch"))
+        else:
+            await send_topics(client_id, topic_index.topics_for(client_id))
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     client_id = str(id(websocket))
@@ -195,12 +835,38 @@ async def websocket_endpoint(websocket: WebSocket):
         await websocket.accept()
         logger.info(f"WebSocket connection accepted: {client_id}")
         
+        # Clients may pick their topics up front with /ws?topics=summary,match:123
+        # Without any, they get every match as before
+        topics = parse_topics(websocket.query_params.get("topics", ""))
+        encoding = negotiate_encoding(websocket.query_params.get("encoding", ""))
+        # Clients following the full list can ask for deltas (/ws?deltas=1), and
+        # resume after a reconnect from the last sequence they saw (/ws?since=<seq>&epoch=<epoch>)
+        since_seq = parse_seq(websocket.query_params.get("since"))
+        since_epoch = websocket.query_params.get("epoch")
+        deltas = since_seq is not None or websocket.query_params.get("deltas") == "1"
+        # Updates are capped per client class (/ws?class=list|detail) and can be
+        # capped further per connection (/ws?max_rate=<updates per second>).
+        # Only peers with the relay token may follow us uncapped as relays
+        client_class = resolve_client_class(
+            websocket.query_params.get("class"), websocket.headers.get("x-relay-token")
+        )
+        min_interval = client_min_interval(client_class, websocket.query_params.get("max_rate"))
+        
         # Initialize client data in the global dictionary
         websocket_clients[client_id] = {
-            "last_sent_hash": "",
+            "last_sent_hashes": {},
             "last_sent_time": time.time(),
+            "implicit_all": not topics,
+            "encoding": encoding,
+            "deltas": deltas,
+            "seq": None,
+            "epoch": None,
+            "client_class": client_class,
+            "min_interval": min_interval,
+            "last_update_time": 0,
             "connection": websocket
         }
+        topic_index.subscribe(client_id, topics or [ALL_TOPIC])
         
         active_connections.append(websocket)
         
@@ -211,27 +877,24 @@ async def websocket_endpoint(websocket: WebSocket):
         # Send initial data immediately
         if tennis_matches:
             try:
-                current_hash = hashlib.md5(json.dumps(tennis_matches, sort_keys=True).encode()).hexdigest()
-                logger.info(f"Sending initial data to client {client_id}, data length: {len(tennis_matches)}")
-                await websocket.send_json(tennis_matches)
+                logger.info(f"Sending initial data to client {client_id}, topics: {sorted(topic_index.topics_for(client_id))}")
+                if is_delta_client(client_id):
+                    await send_resume(client_id, since_seq, since_epoch)
+                else:
+                    await send_topics(client_id, topic_index.topics_for(client_id))
                 logger.info(f"Initial data sent successfully to client {client_id}")
-                websocket_clients[client_id]["last_sent_hash"] = current_hash
-                websocket_clients[client_id]["last_sent_time"] = time.time()
             except Exception as e:
                 logger.error(f"Error sending initial data: {e}")
         else:
             logger.warning(f"No tennis_matches data available to send to client {client_id}")
         
-        # This is a key change - instead of actively polling and sending data,
-        # we now just keep the connection open and wait for client messages
-        # The actual updates are pushed from the process_tennis_data function
+        # Updates are pushed from the process_tennis_data function; the client
+        # only talks to us to change its subscriptions or resume
         while True:
-            # Wait for any message from client (could be ping/heartbeat)
             try:
-                # This will keep the connection open, waiting for client messages
-                # but we won't actually do anything with them for now
                 msg = await websocket.receive_text()
                 logger.debug(f"Received message from client {client_id}: {msg[:20]}...")
+                await handle_client_message(client_id, msg)
             except WebSocketDisconnect:
                 logger.info(f"Client {client_id} disconnected")
                 break
@@ -248,71 +911,290 @@ async def websocket_endpoint(websocket: WebSocket):
         # Clean up client data when connection closes
         if client_id in websocket_clients:
             del websocket_clients[client_id]
+        topic_index.remove_client(client_id)
+        flush_scheduler.cancel(client_id)
             
         logger.info(f"WebSocket connection closed for client {client_id}")
 
 # Broadcast function that will be called from the data processing task
 async def broadcast_data_update(data):
-    """Send data updates to all connected clients, but only if their data is stale"""
-    # Create a hash of the current data
-    current_hash = hashlib.md5(json.dumps(data, sort_keys=True).encode()).hexdigest()
-    current_time = time.time()
-    
-    logger.info(f"Broadcasting data update: {len(data)} items, hash: {current_hash[:8]}...")
+    """Push the current data to every connected client, within its rate limit"""
+    logger.info(f"Broadcasting data update: {len(data)} items, seq {data_version}")
     logger.info(f"Number of connected clients: {len(websocket_clients)}")
     
     if len(websocket_clients) == 0:
         logger.warning("No WebSocket clients connected. Nothing to broadcast to.")
+        return
+    
+    await sync_clients(list(websocket_clients.keys()))
+
+async def flush_rate_limited_clients(client_ids):
+    """Called by the flush scheduler when the rate limit window of these clients ends"""
+    with CYCLE_TRACES.trace("flush", source="main_api", version=data_version, clients=len(client_ids)):
+        await sync_clients([client_id for client_id in client_ids if client_id in websocket_clients])
+
+async def sync_clients(client_ids):
+    """
+    Send each of the given clients what is stale for it: the missed deltas for
+    delta clients, the changed topics for everybody else.
+
+    Clients still inside their rate limit window are deferred to the end of
+    it; they then get the state current at that time, so every update that
+    arrived in between is coalesced into one frame.
+    """
+    current_time = time.time()
+    
+    ready = []
+    for client_id in client_ids:
+        client_info = websocket_clients.get(client_id)
+        if not client_info:
+            continue
+        wait = client_info["last_update_time"] + client_info["min_interval"] - current_time
+        if wait > 0:
+            flush_scheduler.schedule(client_id, wait)
+        else:
+            ready.append(client_id)
+    
+    if not ready:
+        return
+    
+    # Render each topic these clients listen to once, not once per client.
+    # Delta clients do not need the full list rendered
+    topics_to_render = set()
+    for client_id in ready:
+        if not is_delta_client(client_id):
+            topics_to_render |= topic_index.topics_for(client_id)
+    fragments = render_topic_fragments(tennis_matches, topics_to_render, live_board)
+    fragment_hashes = {
+        topic: hashlib.md5(fragment.encode()).hexdigest()
+        for topic, fragment in fragments.items()
+    }
+    
+    # Clients that need the same frame share it, encoded once per encoding
+    frames = {}
     
     # Send to each client if they need an update
-    for client_id, client_info in list(websocket_clients.items()):
+    for client_id in ready:
+        client_info = websocket_clients.get(client_id)
+        if not client_info:
+            continue
         try:
             # Get client-specific data
-            client_last_hash = client_info.get("last_sent_hash", "")
+            client_hashes = client_info.get("last_sent_hashes", {})
             client_last_time = client_info.get("last_sent_time", 0)
             websocket = client_info.get("connection")
             
-            # Determine if we should send an update
-            should_send = False
+            if is_delta_client(client_id):
+                # Delta clients get everything after the last seq they saw
+                frame_key = None
+                sent_topics = ()
+                if (client_info["seq"], client_info["epoch"]) != (data_version, data_epoch):
+                    frame_key = (data_version, "delta", client_info["epoch"], client_info["seq"])
+                    if frame_key not in frames:
+                        frames[frame_key] = build_resume_frame(client_info["seq"], client_info["epoch"], fragments)
+            else:
+                # Send the topics whose data changed from what this client last saw
+                client_topics = [t for t in topic_index.topics_for(client_id) if t in fragments]
+                sent_topics = tuple(sorted(
+                    t for t in client_topics if client_hashes.get(t) != fragment_hashes[t]
+                ))
+                frame_key = (data_version, sent_topics) if sent_topics else None
+                if frame_key and frame_key not in frames:
+                    frames[frame_key] = build_topic_frame(fragments, sent_topics, data_version, data_epoch)
             
-            # Send if data changed from what this client last saw
-            if current_hash != client_last_hash:
-                should_send = True
-                logger.info(f"Data changed, broadcasting to client {client_id}")
-            # Or send heartbeat every 5 seconds even if no change
-            elif current_time - client_last_time > 5:
-                should_send = True
-                logger.debug(f"Sending periodic heartbeat to client {client_id}")
+            if frame_key:
+                logger.info(f"Data changed, sending {frame_key[1:]} to client {client_id}")
+            # Nothing changed for this client, at most it is due a heartbeat
+            elif current_time - client_last_time > WS_HEARTBEAT_INTERVAL:
+                await send_heartbeat(client_id, current_time)
+                continue
             
-            if should_send and websocket:
-                logger.info(f"Sending update to client {client_id}")
+            if frame_key and websocket:
+                frame = frame_encoder.encode(frame_key, frames[frame_key], client_info["encoding"])
                 try:
-                    await websocket.send_json(data)
+                    with span("ws_send", client=client_id, encoding=client_info["encoding"], bytes=len(frame)):
+                        await send_frame(websocket, frame)
                     logger.info(f"Successfully sent data to client {client_id}")
                     # Update client tracking data
-                    websocket_clients[client_id]["last_sent_hash"] = current_hash
-                    websocket_clients[client_id]["last_sent_time"] = current_time
+                    for topic in sent_topics:
+                        client_hashes[topic] = fragment_hashes[topic]
+                    client_info["seq"], client_info["epoch"] = data_version, data_epoch
+                    client_info["last_sent_time"] = client_info["last_update_time"] = current_time
                 except Exception as e:
-                    logger.error(f"Error during send_json to client {client_id}: {e}")
+                    logger.error(f"Error during send_frame to client {client_id}: {e}")
             else:
-                logger.debug(f"Not sending to client {client_id}: should_send={should_send}, websocket exists={websocket is not None}")
+                logger.debug(f"Not sending to client {client_id}: frame_key={frame_key}, websocket exists={websocket is not None}")
         except Exception as e:
             logger.error(f"Error sending to client {client_id}: {e}")
             # If we can't send, remove the client
             try:
                 if client_id in websocket_clients:
                     del websocket_clients[client_id]
+                    topic_index.remove_client(client_id)
+                    flush_scheduler.cancel(client_id)
                     logger.info(f"Removed client {client_id} due to error")
             except:
                 pass
 
+def extract_matches(data):
+    """The bot's /api/tennis wraps the list as {"timestamp": ..., "matches": [...]}"""
+    if isinstance(data, dict):
+        return data.get("matches")
+    return data
+
+async def send_heartbeat(client_id: str, current_time: float) -> None:
+    """Send one client the tiny heartbeat frame for the current data version"""
+    client_info = websocket_clients.get(client_id)
+    if not client_info:
+        return
+    frame = frame_encoder.encode(
+        ("heartbeat", data_version), build_heartbeat_frame(data_version, data_epoch), client_info["encoding"]
+    )
+    try:
+        await send_frame(client_info["connection"], frame)
+        client_info["last_sent_time"] = current_time
+        logger.debug(f"Sent heartbeat (version {data_version}) to client {client_id}")
+    except Exception as e:
+        logger.error(f"Error sending heartbeat to client {client_id}: {e}")
+
+async def send_heartbeats() -> None:
+    """Heartbeat every client that has been idle longer than WS_HEARTBEAT_INTERVAL"""
+    current_time = time.time()
+    for client_id, client_info in list(websocket_clients.items()):
+        if current_time - client_info.get("last_sent_time", 0) > WS_HEARTBEAT_INTERVAL:
+            await send_heartbeat(client_id, current_time)
+
+async def send_heartbeats_periodically():
+    """
+    Keep idle /ws clients heartbeated whatever the feed: workers and relays
+    only publish when the data changes, and the bot pushes far less often than
+    WS_HEARTBEAT_INTERVAL. Checking twice per interval keeps the gap under 1.5x.
+    """
+    while True:
+        await asyncio.sleep(WS_HEARTBEAT_INTERVAL / 2)
+        try:
+            await send_heartbeats()
+        except Exception as e:
+            logger.error(f"Error sending heartbeats: {e}")
+
+def group_match_markets(tennis_data):
+    """
+    Process the data using market grouper. The matches are copied rather than
+    modified, since an embedded bot's snapshot must stay untouched.
+    """
+    grouped_data = []
+    for match in tennis_data:
+        if match.get("rapid_data") and "raw_odds_data" in match["rapid_data"]:
+            try:
+                # Use the standalone function instead of a method on the instance
+                rapid_data = dict(match["rapid_data"])
+                rapid_data["grouped_markets"] = group_markets(
+                    [rapid_data["raw_odds_data"].get("markets", {})]
+                )
+                match = dict(match, rapid_data=rapid_data)
+            except Exception as e:
+                logger.error(f"Error grouping markets for match {match.get('match_id')}: {e}")
+        grouped_data.append(match)
+    return grouped_data
+
+async def publish_tennis_data(tennis_data, version=None, timestamp=None, regroup=True, epoch=None):
+    """
+    Install freshly fetched match data and push it to the WebSocket clients.
+    Returns False if the data did not change.
+    
+    Workers pass the version, timestamp and epoch of the ingest process's
+    snapshot, whose markets are already grouped, so every worker serves the
+    same versions (and ETags and sequence numbers).
+    
+    Every update that changes the data is kept as a trace for /debug/cycles.
+    """
+    with CYCLE_TRACES.trace("update", source="main_api") as trace:
+        changed = await install_tennis_data(trace, tennis_data, version, timestamp, regroup, epoch)
+        if not changed:
+            CYCLE_TRACES.discard(trace)
+        return changed
+
+async def install_tennis_data(trace, tennis_data, version, timestamp, regroup, epoch):
+    """publish_tennis_data within its trace"""
+    global tennis_matches, match_index, live_board, last_processed_data_hash, data_version, data_timestamp, match_hashes, version_event
+    global data_installed_at, data_epoch, market_groups
+    
+    if regroup:
+        with STAGE_SECONDS.time("group", "main_api"), span("group", matches=len(tennis_data)):
+            tennis_data = group_match_markets(tennis_data)
+    
+    # Hash every match, and the data as a whole
+    new_match_hashes, new_data_hash = hash_matches(tennis_data)
+    
+    # The bot refreshes far less often than we poll, so most cycles
+    # bring nothing new: skip those. (A source that numbers
+    # the versions may still move on to another version of the same data,
+    # e.g. after it restarted)
+    same_version = version is None or (version == data_version and (epoch or PROCESS_EPOCH) == data_epoch)
+    if new_data_hash == last_processed_data_hash and same_version:
+        logger.info(f"Tennis data unchanged (version {data_version})")
+        UPDATES.inc("unchanged")
+        return False
+    
+    delta = compute_delta(match_hashes, new_match_hashes, tennis_data)
+    
+    # Matches that are no longer live move to the history cache; a match that
+    # comes back is served from the live index again
+    new_match_index = build_match_index(tennis_data)
+    for match_id, match in match_index.items():
+        if match_id not in new_match_index:
+            match_cache.set(match_id, match)
+    for match_id in new_match_index:
+        match_cache.pop(match_id)
+    
+    tennis_matches = tennis_data
+    match_index = new_match_index
+    market_groups = {}
+    live_board = build_live_board(tennis_data)
+    last_processed_data_hash = new_data_hash
+    match_hashes = new_match_hashes
+    data_version = version if version is not None else data_version + 1
+    data_epoch = epoch or PROCESS_EPOCH
+    data_timestamp = timestamp or datetime.now(eastern_tz).isoformat()
+    data_installed_at = time.time()
+    UPDATES.inc("changed")
+    # SSE clients look this trace up by version once they are woken below
+    trace.set(version=data_version, matches=len(tennis_matches), upserts=len(delta["upserts"]))
+    delta_buffer.append(data_version, delta, data_epoch)
+    # Workers share the ingest process's archive rather than writing their own
+    if match_archive is not None and TENNIS_BOT_FEED != "shared":
+        with span("archive"):
+            match_archive.record(data_version, time.time(), delta["upserts"])
+    # Only changed matches can have new prices; finished matches free their series
+    with span("ticks"):
+        tick_store.update(delta["upserts"], time.time())
+        for match_id in delta["removed"]:
+            tick_store.evict_match(match_id)
+            candle_store.evict_match(match_id)
+    # Wake long-poll requests; later ones wait on a fresh event
+    version_event.set()
+    version_event = asyncio.Event()
+    # Frames encoded for the previous version will not be sent again
+    frame_encoder.reset()
+    logger.info(f"Tennis data updated with {len(tennis_matches)} matches (version {data_version}, hash: {new_data_hash[:8]}...)")
+    
+    if shared_writer is not None:
+        with span("shared_write"):
+            shared_writer.write(data_version, response_cache.get((data_epoch, data_version), "list", list_payload)["identity"])
+    
+    # Broadcast the changed data to the connected WebSocket clients
+    with STAGE_SECONDS.time("broadcast", "main_api"), span("broadcast", clients=len(websocket_clients)):
+        await broadcast_data_update(tennis_matches)
+    logger.info("Broadcasting tennis update to all clients")
+    return True
+
 async def process_tennis_data():
     """
     Processes tennis data for frontend consumption.
     If tennis_bot is available, uses its data directly.
     Otherwise, fetches and processes data directly.
     """
-    global tennis_matches, last_processed_data_hash
+    global tennis_matches
 
     # Initialize with empty data
     if not tennis_matches:
@@ -345,98 +1227,27 @@ async def process_tennis_data():
     if websocket_clients:
         await broadcast_data_update(tennis_matches)
 
+    if TENNIS_BOT_FEED == "shared":
+        await follow_shared_snapshot()
+        return
+    if TENNIS_BOT_FEED == "relay":
+        await relay_upstream()
+        return
+    if TENNIS_BOT_FEED == "embedded":
+        await run_embedded_bot()
+        return
+    if TENNIS_BOT_FEED == "ipc" and IPC_SOCKET_PATH:
+        await stream_tennis_data()
+        return
+
     while True:
         try:
             start_time = time.time()
-            logger.info("Fetching tennis data...")
-            
-            # Log the API endpoint we're trying to connect to
-            logger.info(f"Attempting to fetch data from Tennis Bot API at: {TENNIS_BOT_API}")
-            
-            # Try to fetch from Tennis Bot API
-            try:
-                # Log every attempt to connect to the Tennis Bot API
-                logger.info(f"Making HTTP request to: {TENNIS_BOT_API}")
-                
-                # First try the configured API endpoint
-                response = requests.get(TENNIS_BOT_API, timeout=10)
-                response.raise_for_status()
-                tennis_data = response.json()
-                
-                # Check if we got valid data
-                if not tennis_data or not isinstance(tennis_data, list) or len(tennis_data) == 0:
-                    # Try alternate URL if the primary one fails
-                    logger.warning(f"Invalid or empty data from primary API, trying local alternate: {len(tennis_data) if tennis_data else 0} items")
-                    
-                    # Try alternate URLs if the first one fails (adapt names based on your Docker setup)
-                    alternate_urls = [
-                        "http://localhost:8000/api/tennis",
-                        "http://127.0.0.1:8000/api/tennis",
-                        "http://tennis-bot:8000/api/tennis"
-                    ]
-                    
-                    for alt_url in alternate_urls:
-                        if alt_url != TENNIS_BOT_API:  # Skip if it's the same as primary
-                            try:
-                                logger.info(f"Trying alternate API URL: {alt_url}")
-                                alt_response = requests.get(alt_url, timeout=5)
-                                alt_response.raise_for_status()
-                                tennis_data = alt_response.json()
-                                if tennis_data and isinstance(tennis_data, list) and len(tennis_data) > 0:
-                                    logger.info(f"Successfully fetched {len(tennis_data)} matches from alternate URL: {alt_url}")
-                                    break  # We got good data, break out of the loop
-                            except Exception as e:
-                                logger.warning(f"Alternate URL failed: {alt_url} - {str(e)}")
-                
-                # Still no valid data after trying alternatives
-                if not tennis_data or not isinstance(tennis_data, list) or len(tennis_data) == 0:
-                    logger.warning("All API sources failed, keeping current data")
-                    # Just keep using the current data
-                    tennis_data = tennis_matches
-                else:
-                    logger.info(f"Successfully fetched {len(tennis_data)} matches from Tennis Bot API")
-                
-                # Process the data using market grouper
-                for match in tennis_data:
-                    if "rapid_data" in match and "raw_odds_data" in match["rapid_data"]:
-                        try:
-                            # Use the standalone function instead of a method on the instance
-                            match["rapid_data"]["grouped_markets"] = group_markets(
-                                [match["rapid_data"]["raw_odds_data"].get("markets", {})]
-                            )
-                        except Exception as e:
-                            logger.error(f"Error grouping markets for match {match.get('match_id')}: {e}")
-                
-                # Create a hash of the new data
-                new_data_hash = hashlib.md5(json.dumps(tennis_data, sort_keys=True).encode()).hexdigest()
-                
-                # For tennis data, we should ALWAYS update and broadcast
-                # Live tennis has constant changes (score, serve, points, odds)
-                tennis_matches = tennis_data
-                last_processed_data_hash = new_data_hash
-                logger.info(f"Tennis data updated with {len(tennis_matches)} matches (hash: {new_data_hash[:8]}...)")
-                
-                # Cache matches for history
-                for match in tennis_matches:
-                    match_id = match.get("match_id")
-                    if match_id:
-                        match_cache[match_id] = {
-                            "data": match,
-                            "timestamp": time.time()
-                        }
-                
-                # Always broadcast the update to all connected WebSocket clients
-                # Tennis is a real-time sport with constant data changes
-                await broadcast_data_update(tennis_matches)
-                logger.info("Broadcasting tennis update to all clients")
-                
-            except Exception as e:
-                logger.error(f"Error fetching from Tennis Bot API: {e}")
-                # Keep using current data, don't replace with debug data
+            await poll_tennis_data()
             
             # Sleep until next update cycle
             execution_time = time.time() - start_time
-            sleep_time = max(1, 10 - execution_time)  # Reduce to 10 seconds per cycle, min 1 sec
+            sleep_time = max(1, POLL_INTERVAL - execution_time)  # Min 1 sec
             logger.debug(f"Sleeping for {sleep_time:.2f} seconds before next update")
             await asyncio.sleep(sleep_time)
             
@@ -444,8 +1255,270 @@ async def process_tennis_data():
             logger.error(f"Error in process loop: {e}")
             await asyncio.sleep(10)  # Sleep for a bit before retrying
 
-if __name__ == "__main__":
-    # Check if the build directory exists
+async def relay_upstream():
+    """
+    Relay mode: follow an upstream main_api's /ws delta stream and publish
+    its match list under the upstream's sequence numbers and epoch, so
+    versions, ETags and resume-from-seq carry through a chain of relays. After
+    a disconnect the relay resumes from the last seq it has.
+    """
+    import aiohttp
+    
+    if not RELAY_TOKEN:
+        logger.warning(
+            "WS_RELAY_TOKEN is not set, so the upstream rate limits this relay like any client; "
+            "whenever that skips versions, clients of this relay have to take a full snapshot"
+        )
+    state = RelayState()
+    # The epoch we publish under: the upstream's, until it skips versions on us
+    upstream_epoch = epoch = None
+    while True:
+        url = f"{UPSTREAM_WS_URL}?deltas=1&class=relay"
+        if state.seq is not None:
+            url += f"&since={state.seq}&epoch={state.epoch}"
+        try:
+            async with aiohttp.ClientSession() as session:
+                # The token gets us the uncapped relay class upstream; a header keeps it out of access logs
+                headers = {"X-Relay-Token": RELAY_TOKEN} if RELAY_TOKEN else None
+                async with session.ws_connect(url, compress=15, heartbeat=WS_PING_INTERVAL, headers=headers) as ws:
+                    logger.info(f"Relaying from upstream {url}")
+                    async for msg in ws:
+                        if msg.type != aiohttp.WSMsgType.TEXT:
+                            if msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                                break
+                            continue
+                        result = state.apply(json.loads(msg.data))
+                        if result == RESYNC:
+                            await ws.send_json({"action": "resume", "seq": state.seq, "epoch": state.epoch})
+                        elif result == UPDATED:
+                            if state.epoch != upstream_epoch:
+                                upstream_epoch = epoch = state.epoch
+                            elif state.gap:
+                                # Our deltas do not cover the skipped versions, which clients
+                                # may have from elsewhere: a new epoch makes them take a snapshot
+                                epoch = secrets.token_hex(4)
+                                logger.info(f"Upstream skipped to seq {state.seq}, relaying under new epoch {epoch}")
+                            await publish_tennis_data(
+                                state.match_list(), version=state.seq, regroup=False, epoch=epoch
+                            )
+            logger.warning("Upstream closed the relay stream")
+        except (aiohttp.ClientError, OSError) as e:
+            logger.warning(f"Upstream {UPSTREAM_WS_URL} unavailable: {e}")
+        except Exception as e:
+            logger.error(f"Error relaying from upstream: {e}")
+        await asyncio.sleep(RELAY_RECONNECT_INTERVAL)
+
+async def follow_shared_snapshot():
+    """
+    Worker side of a multi-worker deployment: publish every snapshot the
+    ingest process writes to shared memory, under the ingest's version.
+    """
+    reader = SharedSnapshotReader()
+    logger.info(f"Worker {os.getpid()} following shared snapshots at {reader.path}")
+    while True:
+        try:
+            snapshot = reader.read_if_changed()
+            if snapshot is not None:
+                version, view = snapshot
+                body = view.tobytes()
+                view.release()
+                data = json.loads(body)
+                if await publish_tennis_data(data["matches"], version=version, timestamp=data.get("timestamp"),
+                                             regroup=False, epoch=data.get("epoch")):
+                    # The ingest process already serialized this exact body
+                    response_cache.put_body((data_epoch, version), "list", body)
+        except Exception as e:
+            logger.error(f"Error reading shared snapshot: {e}")
+        await asyncio.sleep(SHARED_SNAPSHOT_POLL_INTERVAL)
+
+def run_ingest_process():
+    """
+    Ingest process of a multi-worker deployment: runs the configured feed and
+    writes every new version to shared memory for the workers. It owns the
+    versions, so it also does the warm start: the saved snapshot is handed to
+    the workers straight away, and the latest one is saved periodically and
+    when the process is stopped.
+    """
+    global shared_writer, data_version
+    
+    # Carry on from the last published version so workers never see it go back
+    previous = SharedSnapshotReader().read_if_changed()
+    if previous is not None:
+        data_version = previous[0]
+        previous[1].release()
+    shared_writer = SharedSnapshotWriter()
+    
+    async def ingest():
+        global match_hashes, last_processed_data_hash, data_version, data_epoch
+        shared_version = data_version
+        if load_saved_snapshot():
+            if data_version < shared_version:
+                # Saved before the last version the workers got: hand it over as
+                # a newer version of this run rather than going back
+                data_version, data_epoch = shared_version + 1, PROCESS_EPOCH
+            match_hashes, last_processed_data_hash = hash_matches(tennis_matches)
+            shared_writer.write(data_version, response_cache.get((data_epoch, data_version), "list", list_payload)["identity"])
+        elif TENNIS_BOT_FEED != "embedded":
+            # Debug fallback data stays local; workers only ever see real versions
+            fetched = await setup_tennis_data()
+            if fetched is not None:
+                await publish_tennis_data(fetched)
+        if SNAPSHOT_FILE_PATH and TENNIS_BOT_FEED in WARM_START_FEEDS:
+            asyncio.create_task(save_snapshot_periodically())
+        
+        # The parent stops this process with SIGTERM; save the snapshot on the way out
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        try:
+            await process_tennis_data()
+        except asyncio.CancelledError:
+            logger.info(f"Ingest process {os.getpid()} stopping")
+        finally:
+            shutdown_event()
+    
+    logger.info(f"Ingest process {os.getpid()} writing snapshots to {shared_writer.path}")
+    asyncio.run(ingest())
+
+async def run_embedded_bot():
+    """
+    Run TennisBot as a task on this event loop and publish its snapshots
+    straight from memory: no HTTP server, JSON round trip or second process.
+    Snapshots that arrive while one is still being published are coalesced
+    into the latest.
+    
+    TennisBot.run() returns after an error in its loop, so a bot that stops
+    marks the feed down (/api/health turns 503) and is started again after
+    EMBEDDED_BOT_RESTART_DELAY seconds; its next snapshot marks it up again.
+    """
+    global feed_error
+    # Imported here so the other feeds never load the bot and its API clients
+    from aggregator.sports.tennis import tennis_bot
+    tennis_bot.setup_logging()
+    
+    arrived = asyncio.Event()
+    latest = {"snapshot": None}
+    
+    def on_snapshot(snapshot):
+        latest["snapshot"] = snapshot
+        arrived.set()
+    
+    def on_bot_exit(task):
+        global feed_error
+        if task.cancelled():
+            return
+        error = task.exception()
+        feed_error = f"embedded TennisBot stopped ({error!r})" if error else "embedded TennisBot stopped"
+        logger.error(f"{feed_error}, restarting it in {EMBEDDED_BOT_RESTART_DELAY} seconds")
+        arrived.set()
+    
+    def start_bot():
+        task = asyncio.create_task(tennis_bot.TennisBot().run())
+        task.add_done_callback(on_bot_exit)
+        return task
+    
+    tennis_bot.snapshot_listeners.append(on_snapshot)
+    bot_task = start_bot()
+    logger.info("Running TennisBot embedded in main_api")
+    try:
+        while True:
+            await arrived.wait()
+            arrived.clear()
+            snapshot, latest["snapshot"] = latest["snapshot"], None
+            if snapshot is not None:
+                logger.info(f"Received snapshot version {snapshot.version} with {len(snapshot)} matches from embedded TennisBot")
+                try:
+                    await publish_tennis_data(list(snapshot.matches))
+                    if not bot_task.done():
+                        feed_error = None
+                except Exception as e:
+                    logger.error(f"Error publishing embedded TennisBot snapshot: {e}")
+            if bot_task.done():
+                await asyncio.sleep(EMBEDDED_BOT_RESTART_DELAY)
+                logger.info("Restarting embedded TennisBot")
+                bot_task = start_bot()
+    finally:
+        tennis_bot.snapshot_listeners.remove(on_snapshot)
+        bot_task.cancel()
+
+async def stream_tennis_data():
+    """
+    Publish every snapshot the bot pushes over its IPC stream as soon as it
+    arrives. While the stream is down, poll over HTTP and keep reconnecting;
+    the bot sends its latest snapshot on every (re)connect, so we resync.
+    """
+    while True:
+        try:
+            async for data in read_snapshot_stream(IPC_SOCKET_PATH):
+                matches = extract_matches(data)
+                if isinstance(matches, list):
+                    logger.info(f"Received snapshot version {data.get('version')} with {len(matches)} matches from Tennis Bot")
+                    await publish_tennis_data(matches)
+            logger.warning("Tennis Bot snapshot stream closed")
+        except OSError as e:
+            logger.warning(f"Tennis Bot snapshot stream unavailable ({e}), polling {TENNIS_BOT_API} instead")
+        except Exception as e:
+            logger.error(f"Error processing Tennis Bot snapshot stream: {e}")
+        
+        await poll_tennis_data()
+        await asyncio.sleep(POLL_INTERVAL)
+
+async def poll_tennis_data():
+    """Fetch the bot's current data over HTTP once and publish it"""
+    logger.info("Fetching tennis data...")
+    
+    # Log the API endpoint we're trying to connect to
+    logger.info(f"Attempting to fetch data from Tennis Bot API at: {TENNIS_BOT_API}")
+    
+    # Try to fetch from Tennis Bot API
+    try:
+        # Log every attempt to connect to the Tennis Bot API
+        logger.info(f"Making HTTP request to: {TENNIS_BOT_API}")
+        
+        # First try the configured API endpoint
+        response = await asyncio.to_thread(requests.get, TENNIS_BOT_API, timeout=10)
+        response.raise_for_status()
+        tennis_data = extract_matches(response.json())
+        
+        # Check if we got valid data
+        if not tennis_data or not isinstance(tennis_data, list) or len(tennis_data) == 0:
+            # Try alternate URL if the primary one fails
+            logger.warning(f"Invalid or empty data from primary API, trying local alternate: {len(tennis_data) if tennis_data else 0} items")
+            
+            # Try alternate URLs if the first one fails (adapt names based on your Docker setup)
+            alternate_urls = [
+                "http://localhost:8000/api/tennis",
+                "http://127.0.0.1:8000/api/tennis",
+                "http://tennis-bot:8000/api/tennis"
+            ]
+            
+            for alt_url in alternate_urls:
+                if alt_url != TENNIS_BOT_API:  # Skip if it's the same as primary
+                    try:
+                        logger.info(f"Trying alternate API URL: {alt_url}")
+                        alt_response = await asyncio.to_thread(requests.get, alt_url, timeout=5)
+                        alt_response.raise_for_status()
+                        tennis_data = extract_matches(alt_response.json())
+                        if tennis_data and isinstance(tennis_data, list) and len(tennis_data) > 0:
+                            logger.info(f"Successfully fetched {len(tennis_data)} matches from alternate URL: {alt_url}")
+                            break  # We got good data, break out of the loop
+                    except Exception as e:
+                        logger.warning(f"Alternate URL failed: {alt_url} - {str(e)}")
+        
+        # Still no valid data after trying alternatives
+        if not tennis_data or not isinstance(tennis_data, list) or len(tennis_data) == 0:
+            logger.warning("All API sources failed, keeping current data")
+            # Just keep using the current data
+            tennis_data = tennis_matches
+        else:
+            logger.info(f"Successfully fetched {len(tennis_data)} matches from Tennis Bot API")
+        
+        await publish_tennis_data(tennis_data)
+        
+    except Exception as e:
+        logger.error(f"Error fetching from Tennis Bot API: {e}")
+        # Keep using current data, don't replace with debug data
+
+def mount_react_build():
+    """Serve the React build's static files, if it has been built"""
     build_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "my-react-app/build")
     if os.path.exists(build_dir):
         logger.info(f"Serving static files from: {build_dir}")
@@ -459,6 +1532,28 @@ if __name__ == "__main__":
                 app.mount(f"/{asset_file}", StaticFiles(directory=os.path.dirname(asset_path), html=False), name=asset_file)
     else:
         logger.error(f"Build directory not found: {build_dir}")
+
+if __name__ == "__main__":
+    uvicorn_options = dict(
+        host="0.0.0.0", port=MAIN_API_PORT,
+        ws_per_message_deflate=WS_PER_MESSAGE_DEFLATE,
+        ws_ping_interval=WS_PING_INTERVAL,
+        ws_ping_timeout=WS_PING_TIMEOUT
+    )
     
-    # Run the FastAPI app
-    uvicorn.run(app, host="0.0.0.0", port=8080)
+    if API_WORKERS > 1:
+        # One ingest process runs the feed; every worker serves its own clients
+        # from the snapshots it shares, on the same listening socket
+        ingest_process = multiprocessing.Process(target=run_ingest_process, name="tennis-ingest", daemon=True)
+        ingest_process.start()
+        os.environ["TENNIS_BOT_FEED"] = "shared"
+        logger.info(f"Starting {API_WORKERS} API workers")
+        try:
+            uvicorn.run("main_api:app", workers=API_WORKERS, **uvicorn_options)
+        finally:
+            ingest_process.terminate()
+    else:
+        mount_react_build()
+        
+        # Run the FastAPI app
+        uvicorn.run(app, **uvicorn_options)
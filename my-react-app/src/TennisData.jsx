@@ -35,6 +35,8 @@ function TennisData() {
   const ws = useRef(null);
   const dataRef = useRef(null);
   const previousDataHash = useRef('');
+  const lastSeq = useRef(null);
+  const lastEpoch = useRef(null);
   
   // Create a separate state for previous match data to compare for highlighting changes
   const [previousMatches, setPreviousMatches] = useState({});
@@ -286,9 +288,29 @@ function TennisData() {
         rawData);
       
       // Parse JSON immediately
-      const jsonData = JSON.parse(rawData);
+      let jsonData = JSON.parse(rawData);
       console.log('⚠️ JSON parsed successfully:', typeof jsonData, Array.isArray(jsonData));
-      
+
+      // Heartbeats only tell us the connection is alive and which data version is current
+      if (jsonData && jsonData.type === 'heartbeat') {
+        logDebug(`Heartbeat received, data version ${jsonData.version}`);
+        return;
+      }
+
+      // Deltas only carry changed and removed matches: apply them to what we have
+      if (jsonData && jsonData.type === 'delta') {
+        const byId = new Map((dataRef.current?.matches || []).map(match => [match.match_id, match]));
+        (jsonData.removed || []).forEach(matchId => byId.delete(matchId));
+        (jsonData.upserts || []).forEach(match => byId.set(match.match_id, match));
+        jsonData = { ...jsonData, matches: Array.from(byId.values()) };
+      }
+
+      // Remember the sequence (and the server run it belongs to) so a reconnect only fetches what we missed
+      if (jsonData && jsonData.seq !== undefined) {
+        lastSeq.current = jsonData.seq;
+        lastEpoch.current = jsonData.epoch ?? null;
+      }
+
       // Handle both array format and object format with 'matches' property
       let matchesData;
       if (Array.isArray(jsonData)) {
@@ -408,7 +430,10 @@ function TennisData() {
     // Setup WebSocket
     const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
     const host = window.location.host;
-    const wsUrl = `${protocol}//${host}/ws`;
+    const resume = lastSeq.current !== null
+      ? `&since=${lastSeq.current}&epoch=${encodeURIComponent(lastEpoch.current ?? '')}`
+      : '';
+    const wsUrl = `${protocol}//${host}/ws?deltas=1${resume}`;
     
     logDebug(`Connecting to WebSocket at ${wsUrl}`);
     console.log(`⚠️ Connecting to WebSocket at ${wsUrl}`);
@@ -7,11 +7,21 @@ import os
 import argparse
 import signal
 import atexit
+import urllib.request
+import urllib.error
+
+# Readiness probes: the bot is ready once it has completed a fetch cycle,
+# main_api once it has a snapshot loaded (see /api/health on each)
+TENNIS_BOT_HEALTH_URL = os.environ.get("TENNIS_BOT_HEALTH_URL", "http://127.0.0.1:8000/api/health")
+MAIN_API_HEALTH_URL = os.environ.get(
+    "MAIN_API_HEALTH_URL", f"http://127.0.0.1:{os.environ.get('MAIN_API_PORT', '8080')}/api/health"
+)
+READY_TIMEOUT = float(os.environ.get("READY_TIMEOUT", "180"))  # Warn if a component is not ready by then
+RESTART_DELAY = 2  # Seconds before restarting a component that exited
+MONITOR_INTERVAL = 0.25  # Seconds between process checks and readiness probes
 
 # Process tracking
-tennis_bot_process = None
-main_api_process = None
-processes = []
+components = []
 
 def signal_handler(sig, frame):
     print("\nShutting down tennis system...")
@@ -19,104 +29,158 @@ def signal_handler(sig, frame):
     sys.exit(0)
 
 def cleanup():
-    for process in processes:
-        if process and process.poll() is None:
-            process.terminate()
+    for component in components:
+        component.stop()
+
+def probe(url):
+    """True if the readiness URL answers 200"""
+    try:
+        with urllib.request.urlopen(url, timeout=1) as response:
+            return response.status == 200
+    except (urllib.error.URLError, OSError):
+        return False
+
+class Component:
+    """
+    One process of the system: started, probed for readiness and restarted
+    independently of the others.
+    """
+
+    def __init__(self, name, script, health_url, base_dir, env, verbose):
+        self.name = name
+        self.script = script
+        self.health_url = health_url
+        self.base_dir = base_dir
+        self.env = env
+        self.verbose = verbose
+        self.process = None
+        self.log = None
+        self.started_at = None
+        self.ready_at = None
+        self.exited_at = None
+        self.restarts = 0
+        self.warned = False
+
+    @property
+    def log_name(self):
+        return f"{self.name}.log"
+
+    def start(self):
+        print(f"Starting {self.script}...")
+        if self.verbose:
+            output = sys.stdout
+        else:
+            # A restart appends to the log of the run that crashed
+            self.log = open(os.path.join(self.base_dir, self.log_name), 'a' if self.restarts else 'w')
+            output = self.log
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.join(self.base_dir, self.script)],
+            stdout=output,
+            stderr=output,
+            env=self.env,
+            cwd=self.base_dir
+        )
+        self.started_at = time.time()
+        self.ready_at = None
+        self.exited_at = None
+        self.warned = False
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
             try:
-                process.wait(timeout=5)
+                self.process.wait(timeout=5)
             except subprocess.TimeoutExpired:
-                process.kill()
+                self.process.kill()
+        if self.log:
+            self.log.close()
+            self.log = None
+
+    def check(self):
+        """
+        Restart the process if it exited, otherwise probe it until it is ready.
+        Returns True the first time it becomes ready after a (re)start.
+        """
+        if self.process.poll() is not None:
+            if self.exited_at is None:
+                self.exited_at = time.time()
+                self.ready_at = None
+                print(f"WARNING: {self.script} exited with code {self.process.returncode}, "
+                      f"restarting in {RESTART_DELAY}s")
+            elif time.time() - self.exited_at >= RESTART_DELAY:
+                if self.log:
+                    self.log.close()
+                self.restarts += 1
+                self.start()
+            return False
+
+        if self.ready_at is not None:
+            return False
+        if probe(self.health_url):
+            self.ready_at = time.time()
+            print(f"{self.name} ready in {self.ready_at - self.started_at:.2f}s (PID {self.process.pid})")
+            return True
+        if not self.warned and time.time() - self.started_at > READY_TIMEOUT:
+            self.warned = True
+            print(f"WARNING: {self.name} not ready after {READY_TIMEOUT:.0f}s, still waiting")
+        return False
 
 def main():
     parser = argparse.ArgumentParser(description='Start the Tennis System')
     parser.add_argument('--verbose', action='store_true', help='Show output in console instead of log files')
+    parser.add_argument('--embedded', action='store_true', help='Run the tennis bot inside main_api.py as a single process')
     args = parser.parse_args()
-    
+
     # Register cleanup handlers
     atexit.register(cleanup)
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
-    
+
     # Current directory
     base_dir = os.path.dirname(os.path.abspath(__file__))
-    
+
     # Set PYTHONPATH
     env = os.environ.copy()
     env["PYTHONPATH"] = base_dir
-    
-    # Start tennis_bot.py
-    print("Starting tennis_bot.py...")
-    if args.verbose:
-        tennis_bot_process = subprocess.Popen(
-            [sys.executable, os.path.join(base_dir, 'aggregator/sports/tennis/tennis_bot.py')],
-            stdout=sys.stdout,
-            stderr=sys.stderr,
-            env=env,
-            cwd=base_dir
-        )
-    else:
-        tennis_bot_log = open(os.path.join(base_dir, 'tennis_bot.log'), 'w')
-        tennis_bot_process = subprocess.Popen(
-            [sys.executable, os.path.join(base_dir, 'aggregator/sports/tennis/tennis_bot.py')],
-            stdout=tennis_bot_log,
-            stderr=tennis_bot_log,
-            env=env,
-            cwd=base_dir
-        )
-    
-    processes.append(tennis_bot_process)
-    
-    # Wait for tennis_bot to initialize
-    print("Waiting for tennis_bot to initialize...")
-    time.sleep(5)
-    
-    # Start main_api.py
-    print("Starting main_api.py...")
-    if args.verbose:
-        main_api_process = subprocess.Popen(
-            [sys.executable, os.path.join(base_dir, 'main_api.py')],
-            stdout=sys.stdout,
-            stderr=sys.stderr,
-            env=env,
-            cwd=base_dir
-        )
+    if args.embedded:
+        env["TENNIS_BOT_FEED"] = "embedded"
+
+    # Both components start at once: main_api serves its saved snapshot (or
+    # polls) until the bot's first snapshot arrives, so neither waits on the other
+    if args.embedded:
+        print("Embedded mode: the tennis bot runs inside main_api.py")
     else:
-        main_api_log = open(os.path.join(base_dir, 'main_api.log'), 'w')
-        main_api_process = subprocess.Popen(
-            [sys.executable, os.path.join(base_dir, 'main_api.py')],
-            stdout=main_api_log,
-            stderr=main_api_log,
-            env=env,
-            cwd=base_dir
-        )
-    
-    processes.append(main_api_process)
-    
-    print("Tennis system started successfully!")
-    print("- Tennis Bot PID:", tennis_bot_process.pid)
-    print("- Main API PID:", main_api_process.pid)
-    
+        components.append(Component(
+            "tennis_bot", 'aggregator/sports/tennis/tennis_bot.py', TENNIS_BOT_HEALTH_URL, base_dir, env, args.verbose
+        ))
+    components.append(Component("main_api", 'main_api.py', MAIN_API_HEALTH_URL, base_dir, env, args.verbose))
+
+    start_time = time.time()
+    for component in components:
+        component.start()
+
     if not args.verbose:
         print("\nLogs are being written to:")
-        print("- Tennis Bot: tennis_bot.log")
-        print("- Main API: main_api.log")
-        print("\nTo view logs in real-time, use: tail -f tennis_bot.log")
-    
+        for component in components:
+            print(f"- {component.name}: {component.log_name}")
+
     print("\nPress Ctrl+C to shutdown the system")
-    
-    # Keep the script running
+
+    # Keep the script running, restarting whichever component crashes
+    all_ready = False
     try:
         while True:
-            # Check if processes are still running
-            if tennis_bot_process.poll() is not None:
-                print(f"WARNING: tennis_bot.py exited with code {tennis_bot_process.returncode}")
-                break
-            
-            if main_api_process.poll() is not None:
-                print(f"WARNING: main_api.py exited with code {main_api_process.returncode}")
-                break
-                
-            time.sleep(1)
+            for component in components:
+                component.check()
+
+            if not all_ready and all(component.ready_at for component in components):
+                all_ready = True
+                print(f"Tennis system ready in {time.time() - start_time:.2f}s")
+                for component in components:
+                    print(f"- {component.name}: ready {component.ready_at - component.started_at:.2f}s after start"
+                          + (f", {component.restarts} restarts" if component.restarts else ""))
+
+            time.sleep(MONITOR_INTERVAL)
     except KeyboardInterrupt:
         print("\nShutting down tennis system...")
     finally: